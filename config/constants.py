@@ -12,6 +12,8 @@ v4: Added warehouse-specific operational parameters:
 
 from datetime import date
 
+import numpy as np
+
 RANDOM_SEED = 42
 
 BACKFILL_START_DATE = date(2022, 2, 1)
@@ -323,6 +325,49 @@ DRIVER_STATUS_DISTRIBUTION = {
     "Inactive": 0.05,
 }
 
+# ── Array forms of the distributions above ──
+# Built once at import so generators never rebuild key/probability lists per row.
+# Index i of *_KEYS is category code i; *_CDF is the normalized cumulative
+# distribution consumed by sample_category().
+
+
+def _mkcdf(distribution: dict) -> tuple:
+    """Return (keys, cdf) arrays for a {category: probability} dict, normalized as rng.choice does."""
+    keys = np.array(list(distribution), dtype=object)
+    cdf = np.cumsum(np.fromiter(distribution.values(), dtype=np.float64))
+    cdf /= cdf[-1]
+    return keys, cdf
+
+
+def sample_category(rng: np.random.Generator, cdf: np.ndarray, n: int = None):
+    """
+    Draw category codes from a precomputed CDF (a scalar code when n is None).
+    Consumes the same uniforms and returns the same picks as rng.choice(keys, size=n, p=probs),
+    without rng.choice's per-call validation and cumsum — use it in generator hot paths.
+    """
+    return np.searchsorted(cdf, rng.random(n), side="right")
+
+
+ORDER_PRIORITY_KEYS, ORDER_PRIORITY_CDF = _mkcdf(ORDER_PRIORITY_DISTRIBUTION)
+SLA_MINUTES_ARR = np.array([SLA_MINUTES[k] for k in ORDER_PRIORITY_KEYS], dtype=np.int32)
+
+ORDER_STATUS_KEYS, ORDER_STATUS_CDF = _mkcdf(ORDER_STATUS_DISTRIBUTION)
+
+CUSTOMER_SEGMENT_KEYS, CUSTOMER_SEGMENT_CDF = _mkcdf(CUSTOMER_SEGMENTS)
+
+DRIVER_STATUS_KEYS, DRIVER_STATUS_CDF = _mkcdf(DRIVER_STATUS_DISTRIBUTION)
+
+# Demand weights are normalized first, as generate_daily_orders used to before rng.choice
+_demand_total = sum(WAREHOUSE_DEMAND_WEIGHTS.values())
+WAREHOUSE_DEMAND_KEYS, WAREHOUSE_DEMAND_CDF = _mkcdf(
+    {wh: w / _demand_total for wh, w in WAREHOUSE_DEMAND_WEIGHTS.items()}
+)
+
+VEHICLE_TYPE_KEYS, VEHICLE_TYPE_CDF = _mkcdf({v: cfg["proportion"] for v, cfg in VEHICLE_TYPES.items()})
+# Inclusive (min, max) capacity and (min, max) speed per vehicle code
+VEHICLE_CAPACITY_ARR = np.array([VEHICLE_TYPES[v]["capacity"] for v in VEHICLE_TYPE_KEYS], dtype=np.int64)
+VEHICLE_SPEED_ARR = np.array([VEHICLE_TYPES[v]["speed"] for v in VEHICLE_TYPE_KEYS], dtype=np.float64)
+
 SUPPLIER_CONFIGS = [
     {
         "name": "FastShip Co",
@@ -449,6 +494,7 @@ ALLOCATION_STRATEGIES = {
     "cost_optimal": 0.20,
     "load_balanced": 0.15,
 }
+ALLOCATION_STRATEGY_KEYS, ALLOCATION_STRATEGY_CDF = _mkcdf(ALLOCATION_STRATEGIES)
 
 INITIAL_STOCK_RANGE = (50, 500)
 REORDER_POINT_RANGE = (20, 100)
@@ -469,6 +515,11 @@ US_HOLIDAYS = {
     (12, 25),
 }
 
+# ── Holidays as month * 100 + day keys ─────────────────────────
+# Date columns are matched with one np.isin(month * 100 + day, US_HOLIDAY_KEYS)
+# instead of a (month, day) tuple lookup per day.
+US_HOLIDAY_KEYS = np.array(sorted(month * 100 + day for month, day in US_HOLIDAYS), dtype=np.int16)
+
 # ── Category growth modifiers ──────────────────────────────────
 # Electronics grows faster YoY; Grocery flat/declining.
 # Creates diverging category revenue lines over 4 years.
@@ -488,3 +539,75 @@ S3_RAW_PREFIX = "raw"
 S3_STATE_PREFIX = "state"
 
 BATCH_ID_PREFIX = "batch"
+
+# ── Storage dtypes for fact tables ─────────────────────────────
+# Applied to each month of backfill output before it is written to Parquet.
+# Low-cardinality labels become categoricals (dictionary-encoded in Parquet)
+# and small counts use narrow ints. Minutes, km, hours and percentages are
+# float32: below 131,072 a float32 sits within 0.004 of the 2-decimal value,
+# so they still round back exactly when loaded into DECIMAL(x,2). Monetary
+# columns stay float64 so values load exactly into DECIMAL(10..12,2).
+FACT_SCHEMAS = {
+    "fact_orders": {
+        "assigned_warehouse_id": "category",
+        "nearest_warehouse_id": "category",
+        "allocation_strategy": "category",
+        "order_priority": "category",
+        "order_status": "category",
+        "experiment_id": "category",
+        "experiment_group": "category",
+        "total_items": "int16",
+        "batch_id": "category",
+    },
+    "fact_order_items": {
+        "product_id": "category",
+        "quantity": "int16",
+        "batch_id": "category",
+    },
+    "fact_inventory_snapshot": {
+        "warehouse_id": "category",
+        "product_id": "category",
+        "opening_stock": "int32",
+        "units_sold": "int32",
+        "units_received": "int32",
+        "units_returned": "int32",
+        "closing_stock": "int32",
+        "units_on_order": "int32",
+        "days_of_supply": "float32",
+        "batch_id": "category",
+    },
+    "fact_shipments": {
+        "supplier_id": "category",
+        "warehouse_id": "category",
+        "product_id": "category",
+        "quantity": "int32",
+        "delay_days": "int16",
+        "batch_id": "category",
+    },
+    "fact_deliveries": {
+        "driver_id": "category",
+        "warehouse_id": "category",
+        "delivery_status": "category",
+        "estimated_eta_minutes": "float32",
+        "actual_delivery_minutes": "float32",
+        "distance_km": "float32",
+        "sla_minutes": "int16",
+        "batch_id": "category",
+    },
+    "fact_driver_activity": {
+        "driver_id": "category",
+        "warehouse_id": "category",
+        "deliveries_completed": "int16",
+        "total_distance_km": "float32",
+        "total_active_hours": "float32",
+        "idle_hours": "float32",
+        "utilization_pct": "float32",
+        "batch_id": "category",
+    },
+    "fact_experiment_assignments": {
+        "experiment_id": "category",
+        "group_name": "category",
+        "warehouse_id": "category",
+        "batch_id": "category",
+    },
+}
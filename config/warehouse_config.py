@@ -3,6 +3,8 @@ Warehouse configuration for 8 US regional fulfillment centers.
 Real city coordinates for accurate distance calculations.
 """
 
+import numpy as np
+
 WAREHOUSES = [
     {
         "warehouse_id": "WH-001",
@@ -109,5 +111,14 @@ WAREHOUSE_CAPACITY = {w["warehouse_id"]: w["capacity_units"] for w in WAREHOUSES
 WAREHOUSE_REGIONS = {w["warehouse_id"]: w["region"] for w in WAREHOUSES}
 DRIVERS_PER_WAREHOUSE = {w["warehouse_id"]: w["drivers"] for w in WAREHOUSES}
 
+# ── Structure-of-arrays view ──
+# Index i is warehouse code i (same order as WAREHOUSE_IDS), so per-order code
+# arrays can gather attributes directly, e.g. WAREHOUSE_ID_ARR[wh_codes].
+WAREHOUSE_ID_ARR = np.array(WAREHOUSE_IDS, dtype=object)
+WAREHOUSE_REGION_ARR = np.array([w["region"] for w in WAREHOUSES], dtype=object)
+WAREHOUSE_LAT = np.array([w["latitude"] for w in WAREHOUSES], dtype=np.float64)
+WAREHOUSE_LON = np.array([w["longitude"] for w in WAREHOUSES], dtype=np.float64)
+WAREHOUSE_COORDS_RAD = np.radians(np.column_stack([WAREHOUSE_LAT, WAREHOUSE_LON])).astype(np.float32)
+
 # Total drivers: 40+42+38+36+34+35+33+37 = 295 (~300)
 TOTAL_DRIVERS = sum(w["drivers"] for w in WAREHOUSES)
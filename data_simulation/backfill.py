@@ -1,73 +1,154 @@
 """
 Backfill script: generates 3 years of historical data (Feb 2022 → Feb 2025).
-Runs locally. Saves partitioned CSV files to output/ directory.
+Runs locally. Saves dimension CSVs and month-partitioned Parquet fact files to output/ directory.
 Upload to S3 separately after generation.
 
 Usage:
     cd Last-Mile-Fulfilment-Optimization
     python -m data_simulation.backfill
 
+    # Quick dev run: a stratified 10% of days from every calendar month
+    BACKFILL_SAMPLE_FRAC=0.1 python -m data_simulation.backfill
+
 Output structure:
     output/raw/dim_product/data.csv
     output/raw/dim_warehouse/data.csv
-    output/raw/fact_orders/date=2022-02-01/data.csv
-    output/raw/fact_orders/date=2022-02-02/data.csv
+    output/raw/fact_orders/month=2022-02/data.parquet   (one row group per day)
+    output/raw/fact_orders/month=2022-03/data.parquet
     ...
 """
 
+from __future__ import annotations
+
 import os
 import sys
 import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import date, timedelta
-
-import numpy as np
-import pandas as pd
+from typing import TYPE_CHECKING
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config.constants import (
-    BACKFILL_END_DATE,
-    BACKFILL_START_DATE,
-    RANDOM_SEED,
-)
-from data_simulation.core.deliveries import generate_daily_deliveries
-from data_simulation.core.dimensions import (
-    generate_dim_customer,
-    generate_dim_date,
-    generate_dim_driver,
-    generate_dim_experiments,
-    generate_dim_product,
-    generate_dim_supplier,
-    generate_dim_warehouse,
+from data_simulation.utils.backfill_common import (
+    WORKER_DIMS,
+    init_worker,
+    partition_dir,
+    renumber_ids,
+    save_parquet_month,
 )
-from data_simulation.core.driver_activity import generate_daily_driver_activity
-from data_simulation.core.experiments import generate_daily_experiment_assignments
-from data_simulation.core.inventory import (
-    generate_daily_inventory_snapshot,
-    initialize_inventory,
-)
-from data_simulation.core.orders import generate_daily_orders
-from data_simulation.core.shipments import generate_daily_shipments
-from data_simulation.state.state_manager import SimulationState
+
+# numpy/pandas/pyarrow and the generator modules are imported inside the functions
+# that use them, so importing this module (tooling, test discovery) stays cheap
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
 
 OUTPUT_DIR = "output"
 
+# Worker processes for the stateless per-day fact tables
+MAX_WORKERS = os.cpu_count() or 1
+# Days generated ahead of the sequential inventory loop (bounds memory held in results)
+PREFETCH_DAYS = MAX_WORKERS * 2
+# Background threads writing finished months while the day loop keeps going
+IO_WORKERS = 2
+# Fraction of days to generate (per calendar month); < 1.0 is for quick dev iteration only
+SAMPLE_FRAC = float(os.environ.get("BACKFILL_SAMPLE_FRAC", "1.0"))
+
 
-def save_csv(df: pd.DataFrame, table_name: str, partition_date: date = None):
+def save_csv(df: pd.DataFrame | pa.Table, table_name: str, partition_date: date = None):
     """Save DataFrame as CSV with optional date partitioning."""
-    if partition_date:
-        path = os.path.join(OUTPUT_DIR, "raw", table_name, f"date={partition_date.isoformat()}")
-    else:
-        path = os.path.join(OUTPUT_DIR, "raw", table_name)
+    from data_simulation.utils.csv_writer import write_csv
+
+    partition = f"date={partition_date.isoformat()}" if partition_date else None
+    write_csv(df, str(partition_dir(OUTPUT_DIR, table_name, partition) / "data.csv"))
+
+
+def _write_month(buffers: dict, month: str):
+    """Write every buffered fact table for the month (runs on the I/O thread pool)."""
+    for table_name, frames in buffers.items():
+        save_parquet_month(OUTPUT_DIR, frames, table_name, month)
+
+
+def sample_day_offsets(dates: list, frac: float, seed: int) -> list:
+    """
+    Stratified day sample: the same fraction of days (at least one) drawn from every
+    calendar month, so seasonality and the weekday mix match the full period.
+    Returns the chosen offsets into dates, in date order.
+    """
+    import numpy as np
+
+    if not 0.0 < frac <= 1.0:
+        raise ValueError(f"BACKFILL_SAMPLE_FRAC must be in (0, 1], got {frac}")
 
-    os.makedirs(path, exist_ok=True)
-    filepath = os.path.join(path, "data.csv")
-    df.to_csv(filepath, index=False)
+    by_month = defaultdict(list)
+    for offset, d in enumerate(dates):
+        by_month[(d.year, d.month)].append(offset)
+
+    rng = np.random.default_rng(seed)
+    picked = []
+    for offsets in by_month.values():
+        k = max(1, round(len(offsets) * frac))
+        picked.extend(rng.choice(offsets, size=k, replace=False).tolist())
+    return sorted(picked)
+
+
+def generate_day_stateless(current_date: date, day_num: int, seed: np.random.SeedSequence) -> tuple:
+    """
+    Generate the fact tables that do not depend on inventory/shipment state for one day.
+    Runs in a worker process with its own child RNG, so output is independent of worker count.
+
+    Delivery and assignment IDs are numbered from 1 here and rewritten onto the
+    global counters by the main process (see renumber_ids).
+
+    Returns: (orders_df, items_df, deliveries_df, driver_activity_df, assignments_df)
+    """
+    import numpy as np
+
+    from data_simulation.core.deliveries import generate_daily_deliveries
+    from data_simulation.core.driver_activity import generate_daily_driver_activity
+    from data_simulation.core.experiments import generate_daily_experiment_assignments
+    from data_simulation.core.orders import generate_daily_orders
+
+    rng = np.random.default_rng(seed)
+    customers_df = WORKER_DIMS["customers"]
+    drivers_df = WORKER_DIMS["drivers"]
+
+    orders_df, items_df = generate_daily_orders(
+        current_date, customers_df, WORKER_DIMS["products"], WORKER_DIMS["experiments"], rng, day_num
+    )
+    deliveries_df, _ = generate_daily_deliveries(current_date, orders_df, customers_df, drivers_df, rng, 1)
+    driver_activity_df = generate_daily_driver_activity(current_date, drivers_df, deliveries_df, rng)
+    assignments_df, _ = generate_daily_experiment_assignments(current_date, orders_df, rng, 1)
+
+    return orders_df, items_df, deliveries_df, driver_activity_df, assignments_df
 
 
 def run_backfill():
     """Main backfill function. Generates all data day-by-day."""
+    import numpy as np
+
+    from config.constants import BACKFILL_END_DATE, BACKFILL_START_DATE, RANDOM_SEED
+    from data_simulation.core.dimensions import (
+        generate_dim_customer,
+        generate_dim_date,
+        generate_dim_driver,
+        generate_dim_experiments,
+        generate_dim_product,
+        generate_dim_supplier,
+        generate_dim_warehouse,
+    )
+    from data_simulation.core.inventory import generate_daily_inventory_snapshot, initialize_inventory
+    from data_simulation.core.shipments import generate_daily_shipments
+    from data_simulation.state.state_manager import SimulationState
+
+    try:
+        from tqdm import tqdm
+    except ImportError:
+        tqdm = None
+
     print("=" * 60)
     print("FULFILLMENT PLATFORM — BACKFILL")
     print(f"Period: {BACKFILL_START_DATE} → {BACKFILL_END_DATE}")
@@ -82,7 +163,7 @@ def run_backfill():
     print("\n[1/3] Generating dimension tables...")
 
     products_df = generate_dim_product(rng)
-    warehouses_df = generate_dim_warehouse()
+    warehouses_table = generate_dim_warehouse()
     suppliers_df = generate_dim_supplier()
     drivers_df = generate_dim_driver(rng)
     customers_df = generate_dim_customer(rng)
@@ -91,7 +172,7 @@ def run_backfill():
 
     # Save dimensions (not date-partitioned)
     save_csv(products_df, "dim_product")
-    save_csv(warehouses_df, "dim_warehouse")
+    save_csv(warehouses_table, "dim_warehouse")
     save_csv(suppliers_df, "dim_supplier")
     save_csv(drivers_df, "dim_driver")
     save_csv(customers_df, "dim_customer")
@@ -99,7 +180,7 @@ def run_backfill():
     save_csv(experiments_df, "dim_experiments")
 
     print(f"  dim_product:    {len(products_df)} rows")
-    print(f"  dim_warehouse:  {len(warehouses_df)} rows")
+    print(f"  dim_warehouse:  {warehouses_table.num_rows} rows")
     print(f"  dim_supplier:   {len(suppliers_df)} rows")
     print(f"  dim_driver:     {len(drivers_df)} rows")
     print(f"  dim_customer:   {len(customers_df)} rows")
@@ -112,8 +193,27 @@ def run_backfill():
     state.inventory_state = initialize_inventory(products_df, rng)
 
     # ── Step 3: Generate Daily Fact Tables ──
-    total_days = (BACKFILL_END_DATE - BACKFILL_START_DATE).days + 1
-    print(f"\n[3/3] Generating {total_days} days of fact data...")
+    # Orders/deliveries/driver activity/assignments don't depend on inventory state,
+    # so they are generated in a process pool. Shipments and inventory chain
+    # day-to-day and stay sequential on the main process.
+    # Each day gets its own pair of child seeds — [0] for the pool worker, [1] for the
+    # sequential step — so a day's draws never depend on how many were made before it.
+    calendar_days = (BACKFILL_END_DATE - BACKFILL_START_DATE).days + 1
+    dates = [BACKFILL_START_DATE + timedelta(days=i) for i in range(calendar_days)]
+    day_seeds = [seq.spawn(2) for seq in np.random.SeedSequence(RANDOM_SEED).spawn(calendar_days)]
+
+    # Seeds are spawned for the full calendar first, so a sampled day's orders
+    # and deliveries match the same day in a full run. Shipments arriving on a
+    # skipped day are received on the next generated day.
+    if SAMPLE_FRAC < 1.0:
+        offsets = sample_day_offsets(dates, SAMPLE_FRAC, RANDOM_SEED)
+        dates = [dates[i] for i in offsets]
+        day_seeds = [day_seeds[i] for i in offsets]
+
+    total_days = len(dates)
+    print(f"\n[3/3] Generating {total_days} days of fact data ({MAX_WORKERS} workers)...")
+    if total_days < calendar_days:
+        print(f"  Sampling {SAMPLE_FRAC:.0%} of days per month (BACKFILL_SAMPLE_FRAC)")
 
     # Tracking totals
     total_orders = 0
@@ -124,76 +224,101 @@ def run_backfill():
     total_assignments = 0
     total_inventory = 0
 
-    current_date = BACKFILL_START_DATE
-    day_num = 0
-
-    while current_date <= BACKFILL_END_DATE:
-        day_num += 1
-        state.day_counter = day_num
-
-        # Progress indicator
-        if day_num % 30 == 0 or day_num == 1:
-            elapsed = time.time() - start_time
-            pct = (day_num / total_days) * 100
-            print(f"  Day {day_num}/{total_days} ({pct:.0f}%) - {current_date} [{elapsed:.0f}s elapsed]")
-
-        # ── Generate orders ──
-        orders_df, items_df = generate_daily_orders(
-            current_date, customers_df, products_df, experiments_df, rng, day_num
-        )
-
-        # ── Generate shipments ──
-        shipments_df, arriving_df, state.pending_shipments, state.shipment_counter = generate_daily_shipments(
-            current_date,
-            products_df,
-            suppliers_df,
-            state.inventory_state,
-            state.pending_shipments,
-            rng,
-            state.shipment_counter,
-        )
-
-        # ── Generate inventory snapshot ──
-        inventory_df, state.inventory_state = generate_daily_inventory_snapshot(
-            current_date, products_df, orders_df, items_df, arriving_df, state.inventory_state, rng
-        )
-
-        # ── Generate deliveries ──
-        deliveries_df, state.delivery_counter = generate_daily_deliveries(
-            current_date, orders_df, customers_df, drivers_df, rng, state.delivery_counter
-        )
-
-        # ── Generate driver activity ──
-        driver_activity_df = generate_daily_driver_activity(current_date, drivers_df, deliveries_df, rng)
-
-        # ── Generate experiment assignments ──
-        assignments_df, state.assignment_counter = generate_daily_experiment_assignments(
-            current_date, orders_df, rng, state.assignment_counter
-        )
-
-        # ── Save daily data ──
-        save_csv(orders_df, "fact_orders", current_date)
-        save_csv(items_df, "fact_order_items", current_date)
-        save_csv(inventory_df, "fact_inventory_snapshot", current_date)
-        save_csv(deliveries_df, "fact_deliveries", current_date)
-        save_csv(driver_activity_df, "fact_driver_activity", current_date)
-
-        if len(shipments_df) > 0:
-            save_csv(shipments_df, "fact_shipments", current_date)
-
-        if len(assignments_df) > 0:
-            save_csv(assignments_df, "fact_experiment_assignments", current_date)
-
-        # Track totals
-        total_orders += len(orders_df)
-        total_items += len(items_df)
-        total_shipments += len(shipments_df)
-        total_deliveries += len(deliveries_df)
-        total_driver_rows += len(driver_activity_df)
-        total_assignments += len(assignments_df)
-        total_inventory += len(inventory_df)
-
-        current_date += timedelta(days=1)
+    # Daily fact frames are buffered per table and handed to a background
+    # writer once per month, so Parquet encoding overlaps the next month's compute
+    month_buffers = defaultdict(list)
+    buffer_month = dates[0].strftime("%Y-%m")
+    write_futures = []
+
+    with (
+        ProcessPoolExecutor(
+            max_workers=MAX_WORKERS,
+            initializer=init_worker,
+            initargs=(customers_df, products_df, drivers_df, experiments_df),
+        ) as pool,
+        ThreadPoolExecutor(max_workers=IO_WORKERS) as io_pool,
+    ):
+
+        def submit_day(idx: int):
+            return pool.submit(generate_day_stateless, dates[idx], idx + 1, day_seeds[idx][0])
+
+        futures = deque(submit_day(i) for i in range(min(PREFETCH_DAYS, total_days)))
+
+        # Loop-invariant lookups bound to locals once instead of resolved per day
+        next_day = futures.popleft
+        default_rng = np.random.default_rng
+
+        # tqdm (optional) throttles its own refreshes; without it, print every 30 days
+        day_iter = tqdm(dates, desc="days", unit="day") if tqdm is not None else dates
+
+        for idx, current_date in enumerate(day_iter):
+            day_num = idx + 1
+            state.day_counter = day_num
+
+            # Progress indicator
+            if tqdm is None and (day_num % 30 == 0 or day_num == 1):
+                elapsed = time.time() - start_time
+                pct = (day_num / total_days) * 100
+                print(f"  Day {day_num}/{total_days} ({pct:.0f}%) - {current_date} [{elapsed:.0f}s elapsed]")
+
+            # ── Collect stateless tables from the pool, keep it PREFETCH_DAYS ahead ──
+            orders_df, items_df, deliveries_df, driver_activity_df, assignments_df = next_day().result()
+            if idx + PREFETCH_DAYS < total_days:
+                futures.append(submit_day(idx + PREFETCH_DAYS))
+
+            state.delivery_counter = renumber_ids(
+                deliveries_df, "delivery_id", "DEL", current_date, state.delivery_counter
+            )
+            state.assignment_counter = renumber_ids(
+                assignments_df, "assignment_id", "ASG", current_date, state.assignment_counter
+            )
+
+            day_rng = default_rng(day_seeds[idx][1])
+
+            # ── Generate shipments ──
+            shipments_df, arriving_df, state.pending_shipments, state.shipment_counter = generate_daily_shipments(
+                current_date,
+                products_df,
+                suppliers_df,
+                state.inventory_state,
+                state.pending_shipments,
+                day_rng,
+                state.shipment_counter,
+            )
+
+            # ── Generate inventory snapshot ──
+            inventory_df, state.inventory_state = generate_daily_inventory_snapshot(
+                current_date, products_df, orders_df, items_df, arriving_df, state.inventory_state, day_rng
+            )
+
+            # ── Buffer daily data (flushed as one Parquet file per month) ──
+            month = current_date.strftime("%Y-%m")
+            if month != buffer_month:
+                write_futures.append(io_pool.submit(_write_month, month_buffers, buffer_month))
+                month_buffers = defaultdict(list)
+                buffer_month = month
+
+            month_buffers["fact_orders"].append(orders_df)
+            month_buffers["fact_order_items"].append(items_df)
+            month_buffers["fact_inventory_snapshot"].append(inventory_df)
+            month_buffers["fact_deliveries"].append(deliveries_df)
+            month_buffers["fact_driver_activity"].append(driver_activity_df)
+            month_buffers["fact_shipments"].append(shipments_df)
+            month_buffers["fact_experiment_assignments"].append(assignments_df)
+
+            # Track totals
+            total_orders += len(orders_df)
+            total_items += len(items_df)
+            total_shipments += len(shipments_df)
+            total_deliveries += len(deliveries_df)
+            total_driver_rows += len(driver_activity_df)
+            total_assignments += len(assignments_df)
+            total_inventory += len(inventory_df)
+
+        write_futures.append(io_pool.submit(_write_month, month_buffers, buffer_month))
+        # Surface any write error before reporting success
+        for future in write_futures:
+            future.result()
 
     # ── Summary ──
     elapsed = time.time() - start_time
@@ -201,7 +326,7 @@ def run_backfill():
     print("BACKFILL COMPLETE")
     print("=" * 60)
     print(f"  Duration:                    {elapsed:.0f} seconds ({elapsed / 60:.1f} min)")
-    print(f"  Days generated:              {day_num}")
+    print(f"  Days generated:              {total_days}")
     print(f"  fact_orders:                 {total_orders:,}")
     print(f"  fact_order_items:            {total_items:,}")
     print(f"  fact_inventory_snapshot:     {total_inventory:,}")
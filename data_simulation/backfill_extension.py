@@ -24,7 +24,7 @@ Output:
     output_extension/raw/dim_supplier/data.csv       <- updated with SCD changes
     output_extension/raw/dim_driver/data.csv         <- updated with SCD changes
     output_extension/raw/dim_customer/data.csv       <- updated with SCD changes
-    output_extension/raw/fact_orders/date=.../       <- new fact data
+    output_extension/raw/fact_orders/month=2025-02/extension.parquet  <- new fact data
     ...
 
 After running:
@@ -39,6 +39,8 @@ After running:
 import os
 import sys
 import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import date, timedelta
 
 import numpy as np
@@ -47,24 +49,28 @@ import pandas as pd
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.constants import BACKFILL_START_DATE, RANDOM_SEED
-from data_simulation.core.deliveries import generate_daily_deliveries
+from data_simulation.backfill import (
+    IO_WORKERS,
+    MAX_WORKERS,
+    PREFETCH_DAYS,
+    generate_day_stateless,
+)
 from data_simulation.core.dimensions import (
+    build_dim_date,
     generate_dim_customer,
     generate_dim_driver,
     generate_dim_experiments,
     generate_dim_product,
     generate_dim_supplier,
-    generate_dim_warehouse,
 )
-from data_simulation.core.driver_activity import generate_daily_driver_activity
-from data_simulation.core.experiments import generate_daily_experiment_assignments
 from data_simulation.core.inventory import (
     generate_daily_inventory_snapshot,
     initialize_inventory,
 )
-from data_simulation.core.orders import generate_daily_orders
 from data_simulation.core.shipments import generate_daily_shipments
 from data_simulation.state.state_manager import SimulationState
+from data_simulation.utils.backfill_common import init_worker, partition_dir, renumber_ids, save_parquet_month
+from data_simulation.utils.csv_writer import write_csv
 
 # ── Extension date range ──────────────────────────────────────
 EXTENSION_START_DATE = date(2025, 2, 2)
@@ -74,13 +80,21 @@ ORIGINAL_BACKFILL_DAYS = (date(2025, 2, 1) - BACKFILL_START_DATE).days + 1  # 10
 OUTPUT_DIR = "output_extension"
 
 
+# Fact files use the month=YYYY-MM layout of backfill.py under their own name:
+# the first extension month (2025-02) is also the original backfill's last month,
+# and both land in the same S3 prefix
+EXTENSION_FILE_NAME = "extension.parquet"
+
+
 def save_csv(df: pd.DataFrame, table_name: str, partition_date: date = None):
-    if partition_date:
-        path = os.path.join(OUTPUT_DIR, "raw", table_name, f"date={partition_date.isoformat()}")
-    else:
-        path = os.path.join(OUTPUT_DIR, "raw", table_name)
-    os.makedirs(path, exist_ok=True)
-    df.to_csv(os.path.join(path, "data.csv"), index=False)
+    partition = f"date={partition_date.isoformat()}" if partition_date else None
+    write_csv(df, str(partition_dir(OUTPUT_DIR, table_name, partition) / "data.csv"))
+
+
+def _write_month(buffers: dict, month: str):
+    """Write every buffered fact table for the month (runs on the I/O thread pool)."""
+    for table_name, frames in buffers.items():
+        save_parquet_month(OUTPUT_DIR, frames, table_name, month, EXTENSION_FILE_NAME)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -98,25 +112,38 @@ def inject_product_changes(products_df: pd.DataFrame, rng: np.random.Generator)
       - 15 products: reorder_point adjusted ±10-20% (operational tuning)
 
     Total: ~50 unique products affected (some overlap between change types).
+    Modifies products_df in place and returns it.
     """
-    df = products_df.copy()
+    df = products_df
     n = len(df)
 
+    # Each column is updated on a NumPy copy of its values and written back
+    # once, rather than through pandas .loc reads and writes per change
+    cost_price = df["cost_price"].to_numpy(dtype=np.float64, copy=True)
+    selling_price = df["selling_price"].to_numpy(dtype=np.float64, copy=True)
+    safety_stock = df["safety_stock"].to_numpy(copy=True)
+    reorder_point = df["reorder_point"].to_numpy(copy=True)
+
     # Price increases — 25 products, 5-15% increase
     price_idx = rng.choice(n, size=25, replace=False)
     price_multiplier = rng.uniform(1.05, 1.15, size=25)
-    df.loc[price_idx, "cost_price"] = (df.loc[price_idx, "cost_price"] * price_multiplier).round(2)
-    df.loc[price_idx, "selling_price"] = (df.loc[price_idx, "selling_price"] * price_multiplier).round(2)
+    cost_price[price_idx] = np.round(cost_price[price_idx] * price_multiplier, 2)
+    selling_price[price_idx] = np.round(selling_price[price_idx] * price_multiplier, 2)
 
     # Safety stock increases — 20 products that had stockouts, increase 20-40%
     ss_idx = rng.choice(n, size=20, replace=False)
     ss_multiplier = rng.uniform(1.20, 1.40, size=20)
-    df.loc[ss_idx, "safety_stock"] = (df.loc[ss_idx, "safety_stock"] * ss_multiplier).round(0).astype(int)
+    safety_stock[ss_idx] = np.round(safety_stock[ss_idx] * ss_multiplier)
 
     # Reorder point adjustments — 15 products, ±10-20%
     rop_idx = rng.choice(n, size=15, replace=False)
     rop_multiplier = rng.uniform(0.80, 1.20, size=15)
-    df.loc[rop_idx, "reorder_point"] = (df.loc[rop_idx, "reorder_point"] * rop_multiplier).round(0).astype(int)
+    reorder_point[rop_idx] = np.round(reorder_point[rop_idx] * rop_multiplier)
+
+    df["cost_price"] = cost_price
+    df["selling_price"] = selling_price
+    df["safety_stock"] = safety_stock
+    df["reorder_point"] = reorder_point
 
     changed = len(set(price_idx) | set(ss_idx) | set(rop_idx))
     print(f"  snap_product : {changed} products changed")
@@ -135,8 +162,9 @@ def inject_supplier_changes(suppliers_df: pd.DataFrame, rng: np.random.Generator
       - 3 suppliers: reliability_score degrades slightly (supply chain disruption)
       - 3 suppliers: reliability_score improves (supplier performance program)
       - 4 suppliers: average_lead_time adjusted ±1-2 days
+    Modifies suppliers_df in place and returns it.
     """
-    df = suppliers_df.copy()
+    df = suppliers_df
     n = len(df)
 
     # Reliability changes — split 3 degrade, 3 improve
@@ -180,29 +208,32 @@ def inject_driver_changes(drivers_df: pd.DataFrame, rng: np.random.Generator) ->
         (represents vacation/sick leave during extension period)
       - 10 drivers: vehicle_type upgrade (Car → Van, Van → Truck)
         (represents fleet upgrades / promotions)
+    Modifies drivers_df in place and returns it.
     """
-    df = drivers_df.copy()
-    len(df)
+    df = drivers_df
+
+    # Drivers are picked as row positions, so changes are written with .iloc
+    status_col = df.columns.get_loc("availability_status")
+    vehicle_col = df.columns.get_loc("vehicle_type")
+    capacity_col = df.columns.get_loc("max_delivery_capacity")
 
     # Status changes — 20 drivers currently Active go On Leave
-    active_mask = df["availability_status"] == "Active"
-    active_idx = df[active_mask].index.tolist()
+    active_idx = np.flatnonzero((df["availability_status"] == "Active").to_numpy())
     leave_idx = rng.choice(active_idx, size=min(20, len(active_idx)), replace=False)
-    df.loc[leave_idx, "availability_status"] = "On Leave"
+    df.iloc[leave_idx, status_col] = "On Leave"
 
     # Vehicle upgrades — 10 drivers promoted
     upgrade_map = {"Car": "Van", "Van": "Truck"}
-    upgradeable = df[df["vehicle_type"].isin(["Car", "Van"])].index.tolist()
+    upgradeable = np.flatnonzero(df["vehicle_type"].isin(["Car", "Van"]).to_numpy())
     upgrade_idx = rng.choice(upgradeable, size=min(10, len(upgradeable)), replace=False)
-    df.loc[upgrade_idx, "vehicle_type"] = df.loc[upgrade_idx, "vehicle_type"].map(upgrade_map)
+    new_types = [upgrade_map[t] for t in df["vehicle_type"].to_numpy()[upgrade_idx]]
+    df.iloc[upgrade_idx, vehicle_col] = new_types
 
-    # Capacity update for upgraded drivers
+    # Capacity update for upgraded drivers: one draw with per-driver bounds
+    # (same values, in the same order, as drawing driver by driver)
     capacity_map = {"Van": (15, 25), "Truck": (25, 40)}
-    for idx in upgrade_idx:
-        new_type = df.loc[idx, "vehicle_type"]
-        if new_type in capacity_map:
-            lo, hi = capacity_map[new_type]
-            df.loc[idx, "max_delivery_capacity"] = int(rng.integers(lo, hi + 1))
+    bounds = np.array([capacity_map[t] for t in new_types], dtype=np.int64).reshape(-1, 2)
+    df.iloc[upgrade_idx, capacity_col] = rng.integers(bounds[:, 0], bounds[:, 1] + 1)
 
     print(f"  snap_driver  : {len(leave_idx) + len(upgrade_idx)} drivers changed")
     print(f"    Status -> On Leave    : {len(leave_idx)} drivers")
@@ -221,22 +252,25 @@ def inject_customer_changes(customers_df: pd.DataFrame, rng: np.random.Generator
 
     No downgrades — companies track segment upgrades, not downgrades in SCD.
     This simulates customers becoming more engaged over the 13-month extension.
+    Modifies customers_df in place and returns it.
     """
-    df = customers_df.copy()
+    df = customers_df
+
+    # Segment and order_frequency_score change together for each upgraded row
+    segment_col = df.columns.get_loc("customer_segment")
+    score_col = df.columns.get_loc("order_frequency_score")
 
     # Occasional → Regular (150 customers)
-    occasional_mask = df["customer_segment"] == "Occasional"
-    occasional_idx = df[occasional_mask].index.tolist()
+    occasional_idx = np.flatnonzero((df["customer_segment"] == "Occasional").to_numpy())
     upgrade1_idx = rng.choice(occasional_idx, size=min(150, len(occasional_idx)), replace=False)
-    df.loc[upgrade1_idx, "customer_segment"] = "Regular"
-    df.loc[upgrade1_idx, "order_frequency_score"] = rng.uniform(0.30, 0.69, size=len(upgrade1_idx)).round(2)
+    df.iloc[upgrade1_idx, segment_col] = "Regular"
+    df.iloc[upgrade1_idx, score_col] = rng.uniform(0.30, 0.69, size=len(upgrade1_idx)).round(2)
 
     # Regular → Premium (50 customers)
-    regular_mask = df["customer_segment"] == "Regular"
-    regular_idx = df[regular_mask].index.tolist()
+    regular_idx = np.flatnonzero((df["customer_segment"] == "Regular").to_numpy())
     upgrade2_idx = rng.choice(regular_idx, size=min(50, len(regular_idx)), replace=False)
-    df.loc[upgrade2_idx, "customer_segment"] = "Premium"
-    df.loc[upgrade2_idx, "order_frequency_score"] = rng.uniform(0.70, 1.00, size=len(upgrade2_idx)).round(2)
+    df.iloc[upgrade2_idx, segment_col] = "Premium"
+    df.iloc[upgrade2_idx, score_col] = rng.uniform(0.70, 1.00, size=len(upgrade2_idx)).round(2)
 
     print(f"  snap_customer: {len(upgrade1_idx) + len(upgrade2_idx)} customers upgraded")
     print(f"    Occasional -> Regular : {len(upgrade1_idx)} customers")
@@ -252,42 +286,7 @@ def inject_customer_changes(customers_df: pd.DataFrame, rng: np.random.Generator
 
 def generate_extended_dim_date() -> pd.DataFrame:
     """Generate dim_date rows for extension period only (Feb 2, 2025 → Feb 28, 2026)."""
-    from config.constants import US_HOLIDAYS
-
-    season_map = {
-        12: "Winter",
-        1: "Winter",
-        2: "Winter",
-        3: "Spring",
-        4: "Spring",
-        5: "Spring",
-        6: "Summer",
-        7: "Summer",
-        8: "Summer",
-        9: "Fall",
-        10: "Fall",
-        11: "Fall",
-    }
-    rows = []
-    current = EXTENSION_START_DATE
-    while current <= EXTENSION_END_DATE:
-        rows.append(
-            {
-                "date": current,
-                "day_of_week": current.strftime("%A"),
-                "day_of_week_num": current.isoweekday(),
-                "week_number": current.isocalendar()[1],
-                "month": current.month,
-                "month_name": current.strftime("%B"),
-                "quarter": (current.month - 1) // 3 + 1,
-                "year": current.year,
-                "is_holiday": (current.month, current.day) in US_HOLIDAYS,
-                "is_weekend": current.isoweekday() >= 6,
-                "season": season_map[current.month],
-            }
-        )
-        current += timedelta(days=1)
-    return pd.DataFrame(rows)
+    return build_dim_date(EXTENSION_START_DATE, EXTENSION_END_DATE)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -304,7 +303,7 @@ def run_extension_backfill():
 
     start_time = time.time()
 
-    # RNG for fact data (seed+1 so sequences differ from original)
+    # RNG for the initial inventory (seed+1 so sequences differ from original)
     rng = np.random.default_rng(RANDOM_SEED + 1)
     # Separate RNG for SCD changes (seed+2 for full independence)
     rng_scd = np.random.default_rng(RANDOM_SEED + 2)
@@ -319,14 +318,15 @@ def run_extension_backfill():
     print("\n[2/4] Loading dimensions and injecting SCD Type 2 changes...")
     rng_dims = np.random.default_rng(RANDOM_SEED)  # same seed as original — identical dims
     products_df = generate_dim_product(rng_dims)
-    generate_dim_warehouse()
     suppliers_df = generate_dim_supplier()
     drivers_df = generate_dim_driver(rng_dims)
     customers_df = generate_dim_customer(rng_dims)
     experiments_df = generate_dim_experiments()
 
     # Inject changes — these updated versions go to S3/Snowflake
-    # dbt snapshot will compare against previous snapshot and record the diffs
+    # dbt snapshot will compare against previous snapshot and record the diffs.
+    # The injectors modify the freshly generated frames in place (no copies);
+    # the *_updated names refer to the same objects.
     print("\n  Injecting dimension changes for SCD Type 2 tracking:")
     products_updated = inject_product_changes(products_df, rng_scd)
     suppliers_updated = inject_supplier_changes(suppliers_df, rng_scd)
@@ -357,71 +357,101 @@ def run_extension_backfill():
     )
 
     # ── Step 4: Generate daily fact data ─────────────────────
+    # Same split as backfill.py: orders/deliveries/driver activity/assignments
+    # are generated ahead in a process pool, while shipments and inventory
+    # chain day-to-day on the main process. Each day gets its own pair of
+    # child seeds ([0] pool worker, [1] sequential step), so output does not
+    # depend on the worker count.
     total_days = (EXTENSION_END_DATE - EXTENSION_START_DATE).days + 1
-    print(f"\n[4/4] Generating {total_days} days of fact data...")
+    dates = [EXTENSION_START_DATE + timedelta(days=i) for i in range(total_days)]
+    day_seeds = [seq.spawn(2) for seq in np.random.SeedSequence(RANDOM_SEED + 1).spawn(total_days)]
+    print(f"\n[4/4] Generating {total_days} days of fact data ({MAX_WORKERS} workers)...")
 
     total_orders = total_items = total_shipments = 0
     total_deliveries = total_driver_rows = total_assignments = total_inventory = 0
 
-    current_date = EXTENSION_START_DATE
-    day_num = 0
-
-    while current_date <= EXTENSION_END_DATE:
-        day_num += 1
-        state.day_counter = ORIGINAL_BACKFILL_DAYS + day_num
-
-        if day_num % 30 == 0 or day_num == 1:
-            elapsed = time.time() - start_time
-            pct = (day_num / total_days) * 100
-            print(f"  Day {day_num}/{total_days} ({pct:.0f}%) — {current_date} [{elapsed:.0f}s elapsed]")
-
-        orders_df, items_df = generate_daily_orders(
-            current_date, customers_updated, products_updated, experiments_df, rng, state.day_counter
-        )
-
-        shipments_df, arriving_df, state.pending_shipments, state.shipment_counter = generate_daily_shipments(
-            current_date,
-            products_updated,
-            suppliers_updated,
-            state.inventory_state,
-            state.pending_shipments,
-            rng,
-            state.shipment_counter,
-        )
-
-        inventory_df, state.inventory_state = generate_daily_inventory_snapshot(
-            current_date, products_updated, orders_df, items_df, arriving_df, state.inventory_state, rng
-        )
-
-        deliveries_df, state.delivery_counter = generate_daily_deliveries(
-            current_date, orders_df, customers_updated, drivers_updated, rng, state.delivery_counter
-        )
-
-        driver_activity_df = generate_daily_driver_activity(current_date, drivers_updated, deliveries_df, rng)
-
-        assignments_df, state.assignment_counter = generate_daily_experiment_assignments(
-            current_date, orders_df, rng, state.assignment_counter
-        )
-
-        save_csv(orders_df, "fact_orders", current_date)
-        save_csv(items_df, "fact_order_items", current_date)
-        save_csv(inventory_df, "fact_inventory_snapshot", current_date)
-        save_csv(deliveries_df, "fact_deliveries", current_date)
-        save_csv(driver_activity_df, "fact_driver_activity", current_date)
-        if len(shipments_df) > 0:
-            save_csv(shipments_df, "fact_shipments", current_date)
-        if len(assignments_df) > 0:
-            save_csv(assignments_df, "fact_experiment_assignments", current_date)
-
-        total_orders += len(orders_df)
-        total_items += len(items_df)
-        total_shipments += len(shipments_df)
-        total_deliveries += len(deliveries_df)
-        total_driver_rows += len(driver_activity_df)
-        total_assignments += len(assignments_df)
-        total_inventory += len(inventory_df)
-
-        current_date += timedelta(days=1)
+    # Daily fact frames are buffered per table and handed to a background
+    # writer once per month, so Parquet encoding overlaps the next month's compute
+    month_buffers = defaultdict(list)
+    buffer_month = dates[0].strftime("%Y-%m")
+    write_futures = []
+
+    with (
+        ProcessPoolExecutor(
+            max_workers=MAX_WORKERS,
+            initializer=init_worker,
+            initargs=(customers_updated, products_updated, drivers_updated, experiments_df),
+        ) as pool,
+        ThreadPoolExecutor(max_workers=IO_WORKERS) as io_pool,
+    ):
+
+        def submit_day(idx: int):
+            return pool.submit(generate_day_stateless, dates[idx], ORIGINAL_BACKFILL_DAYS + idx + 1, day_seeds[idx][0])
+
+        futures = deque(submit_day(i) for i in range(min(PREFETCH_DAYS, total_days)))
+
+        for idx, current_date in enumerate(dates):
+            day_num = idx + 1
+            state.day_counter = ORIGINAL_BACKFILL_DAYS + day_num
+
+            if day_num % 30 == 0 or day_num == 1:
+                elapsed = time.time() - start_time
+                pct = (day_num / total_days) * 100
+                print(f"  Day {day_num}/{total_days} ({pct:.0f}%) — {current_date} [{elapsed:.0f}s elapsed]")
+
+            orders_df, items_df, deliveries_df, driver_activity_df, assignments_df = futures.popleft().result()
+            if idx + PREFETCH_DAYS < total_days:
+                futures.append(submit_day(idx + PREFETCH_DAYS))
+
+            state.delivery_counter = renumber_ids(
+                deliveries_df, "delivery_id", "DEL", current_date, state.delivery_counter
+            )
+            state.assignment_counter = renumber_ids(
+                assignments_df, "assignment_id", "ASG", current_date, state.assignment_counter
+            )
+
+            day_rng = np.random.default_rng(day_seeds[idx][1])
+
+            shipments_df, arriving_df, state.pending_shipments, state.shipment_counter = generate_daily_shipments(
+                current_date,
+                products_updated,
+                suppliers_updated,
+                state.inventory_state,
+                state.pending_shipments,
+                day_rng,
+                state.shipment_counter,
+            )
+
+            inventory_df, state.inventory_state = generate_daily_inventory_snapshot(
+                current_date, products_updated, orders_df, items_df, arriving_df, state.inventory_state, day_rng
+            )
+
+            month = current_date.strftime("%Y-%m")
+            if month != buffer_month:
+                write_futures.append(io_pool.submit(_write_month, month_buffers, buffer_month))
+                month_buffers = defaultdict(list)
+                buffer_month = month
+
+            month_buffers["fact_orders"].append(orders_df)
+            month_buffers["fact_order_items"].append(items_df)
+            month_buffers["fact_inventory_snapshot"].append(inventory_df)
+            month_buffers["fact_deliveries"].append(deliveries_df)
+            month_buffers["fact_driver_activity"].append(driver_activity_df)
+            month_buffers["fact_shipments"].append(shipments_df)
+            month_buffers["fact_experiment_assignments"].append(assignments_df)
+
+            total_orders += len(orders_df)
+            total_items += len(items_df)
+            total_shipments += len(shipments_df)
+            total_deliveries += len(deliveries_df)
+            total_driver_rows += len(driver_activity_df)
+            total_assignments += len(assignments_df)
+            total_inventory += len(inventory_df)
+
+        write_futures.append(io_pool.submit(_write_month, month_buffers, buffer_month))
+        # Surface any write error before reporting success
+        for future in write_futures:
+            future.result()
 
     # ── Summary ──────────────────────────────────────────────
     elapsed = time.time() - start_time
@@ -439,7 +469,7 @@ def run_extension_backfill():
     print("EXTENSION BACKFILL COMPLETE")
     print("=" * 60)
     print(f"  Duration                    : {elapsed:.0f}s ({elapsed / 60:.1f} min)")
-    print(f"  Days generated              : {day_num}")
+    print(f"  Days generated              : {total_days}")
     print(f"  fact_orders                 : {total_orders:,}")
     print(f"  fact_order_items            : {total_items:,}")
     print(f"  fact_inventory_snapshot     : {total_inventory:,}")
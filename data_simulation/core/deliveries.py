@@ -13,22 +13,72 @@ v2: Added warehouse-specific operational realism:
     warehouse-level performance gaps as the post-processing DAG updates.
 """
 
-from datetime import date, datetime, timedelta
+from datetime import date
 from typing import Tuple
 
 import numpy as np
 import pandas as pd
 
 from config.constants import (
-    BATCH_ID_PREFIX,
-    SLA_MINUTES,
+    ORDER_PRIORITY_KEYS,
+    SLA_MINUTES_ARR,
     WAREHOUSE_CONGESTION_FACTORS,
     WAREHOUSE_DISTANCE_FACTORS,
     WAREHOUSE_SLA_FAILURE_BIAS,
 )
 from config.warehouse_config import WAREHOUSE_IDS
 from data_simulation.utils.cost import calculate_delivery_cost
-from data_simulation.utils.geo import get_delivery_distance
+from data_simulation.utils.frame_cache import reuse_for_same_frame
+from data_simulation.utils.geo import get_delivery_distances
+from data_simulation.utils.ids import day_stamp, sequence_ids
+
+# Per-warehouse factors as arrays indexed by position in WAREHOUSE_IDS
+_DISTANCE_FACTOR = np.array([WAREHOUSE_DISTANCE_FACTORS.get(wh, 1.0) for wh in WAREHOUSE_IDS])
+_CONGESTION_STD = np.array([WAREHOUSE_CONGESTION_FACTORS.get(wh, 0.20) for wh in WAREHOUSE_IDS])
+_SLA_FAILURE_BIAS = np.array([WAREHOUSE_SLA_FAILURE_BIAS.get(wh, 0.0) for wh in WAREHOUSE_IDS])
+
+_WAREHOUSE_INDEX = pd.Index(WAREHOUSE_IDS)
+
+# Priority label -> position in ORDER_PRIORITY_KEYS / SLA_MINUTES_ARR
+_PRIORITY_INDEX = pd.Index(ORDER_PRIORITY_KEYS)
+
+_DELIVERY_STATUSES = np.array(["Assigned", "In Transit", "Delivered", "Failed"], dtype=object)
+_ASSIGNED, _IN_TRANSIT, _DELIVERED, _FAILED = range(len(_DELIVERY_STATUSES))
+
+
+@reuse_for_same_frame
+def _customer_coords(customers_df: pd.DataFrame) -> tuple:
+    """Customer id index plus latitude/longitude arrays in the same positions."""
+    return (
+        pd.Index(customers_df["customer_id"]),
+        customers_df["latitude"].to_numpy(dtype=np.float64),
+        customers_df["longitude"].to_numpy(dtype=np.float64),
+    )
+
+
+@reuse_for_same_frame
+def _driver_pools(drivers_df: pd.DataFrame) -> tuple:
+    """
+    Active drivers per warehouse, laid out back to back in one array, with
+    each driver's speed stored at the same position.
+    Returns: (driver_pool, speed_pool, pool_start, pool_size), where the
+    pool for WAREHOUSE_IDS[k] is pool_start[k] : pool_start[k] + pool_size[k].
+    """
+    speed_lookup = dict(zip(drivers_df["driver_id"], drivers_df["avg_speed_kmh"]))
+    active_drivers = drivers_df[drivers_df["availability_status"] == "Active"]
+    id_pools = []
+    speed_pools = []
+    for wh_id in WAREHOUSE_IDS:
+        wh_drivers = active_drivers[active_drivers["warehouse_id"] == wh_id]
+        if len(wh_drivers) > 0:
+            id_pools.append(wh_drivers["driver_id"].to_numpy())
+            speed_pools.append(wh_drivers["avg_speed_kmh"].to_numpy(dtype=np.float64))
+        else:
+            id_pools.append(np.array(["DRV-0001"], dtype=object))  # fallback
+            speed_pools.append(np.array([speed_lookup.get("DRV-0001", 35.0)], dtype=np.float64))
+    pool_size = np.array([len(p) for p in id_pools])
+    pool_start = np.concatenate([[0], np.cumsum(pool_size)[:-1]])
+    return np.concatenate(id_pools), np.concatenate(speed_pools), pool_start, pool_size
 
 
 def generate_daily_deliveries(
@@ -42,10 +92,12 @@ def generate_daily_deliveries(
     """
     Generate fact_deliveries for a single day.
     One delivery per order (excluding cancelled orders).
+    All deliveries are computed together as column arrays; every random
+    draw is made once for the whole day.
 
     Returns: (deliveries_df, updated_counter)
     """
-    batch_id = f"{BATCH_ID_PREFIX}_{current_date.strftime('%Y%m%d')}"
+    date_str, batch_id, day_start = day_stamp(current_date)
 
     # Filter out cancelled orders
     active_orders = orders_df[orders_df["order_status"] != "Cancelled"]
@@ -53,137 +105,129 @@ def generate_daily_deliveries(
     if len(active_orders) == 0:
         return pd.DataFrame(), delivery_counter
 
-    # Build customer lookup
-    customer_lookup = customers_df.set_index("customer_id")[["latitude", "longitude"]].to_dict("index")
-
-    # Build active drivers per warehouse
-    active_drivers = drivers_df[drivers_df["availability_status"] == "Active"]
-    drivers_by_wh = {}
-    for wh_id in WAREHOUSE_IDS:
-        wh_drivers = active_drivers[active_drivers["warehouse_id"] == wh_id]
-        if len(wh_drivers) > 0:
-            drivers_by_wh[wh_id] = wh_drivers["driver_id"].values
-        else:
-            drivers_by_wh[wh_id] = np.array(["DRV-0001"])  # fallback
-
-    rows = []
-
-    for _, order in active_orders.iterrows():
-        delivery_id = f"DEL-{current_date.strftime('%Y%m%d')}-{delivery_counter:05d}"
-
-        wh_id = order["assigned_warehouse_id"]
-        customer_id = order["customer_id"]
-
-        # Get customer location
-        cust_info = customer_lookup.get(customer_id, {"latitude": 40.0, "longitude": -74.0})
-        cust_lat = cust_info["latitude"]
-        cust_lon = cust_info["longitude"]
-
-        # Distance with warehouse-specific road factor
-        distance_km = get_delivery_distance(wh_id, cust_lat, cust_lon)
-        distance_factor = WAREHOUSE_DISTANCE_FACTORS.get(wh_id, 1.0)
-
-        # Assign driver (round-robin within warehouse)
-        available = drivers_by_wh.get(wh_id, np.array(["DRV-0001"]))
-        driver_id = rng.choice(available)
-
-        # Get driver speed
-        driver_info = drivers_df[drivers_df["driver_id"] == driver_id]
-        if len(driver_info) > 0:
-            avg_speed = driver_info.iloc[0]["avg_speed_kmh"]
-        else:
-            avg_speed = 35.0
-
-        # Estimated ETA with warehouse distance factor
-        handling_minutes = rng.uniform(5, 20)
-        estimated_eta = round((distance_km / avg_speed) * 60 * distance_factor + handling_minutes, 2)
-
-        # ── Warehouse-specific ETA variability ──────────────────
-        # NYC (std=0.35) is highly unpredictable due to traffic/parking.
-        # Denver (std=0.10) is very consistent in suburban environment.
-        # This creates realistic variance in actual_delivery_minutes
-        # that directly drives on_time_flag and sla_breach_flag differences
-        # across warehouses — no post-processing needed for future data.
-        congestion_std = WAREHOUSE_CONGESTION_FACTORS.get(wh_id, 0.20)
-        variability = rng.normal(1.0, congestion_std)
-        variability = max(0.6, min(2.0, variability))  # clip to reasonable range
-        actual_delivery = round(estimated_eta * variability, 2)
-
-        # SLA based on priority
-        priority = order["order_priority"]
-        sla = SLA_MINUTES[priority]
-
-        # Delivery status
-        order_status = order["order_status"]
-        if order_status == "Delivered":
-            delivery_status = "Delivered"
-        elif order_status == "Shipped":
-            delivery_status = rng.choice(["In Transit", "Delivered"], p=[0.6, 0.4])
-        elif order_status == "Processing":
-            delivery_status = "Assigned"
-        else:
-            delivery_status = "Assigned"
-
-        # Failed deliveries (~4%)
-        if delivery_status == "Delivered" and rng.random() < 0.04:
-            delivery_status = "Failed"
-
-        # Timestamps
-        order_ts = order["order_timestamp"]
-        assigned_time = order_ts + timedelta(minutes=int(rng.integers(5, 30)))
-        pickup_time = assigned_time + timedelta(minutes=int(rng.integers(10, 45)))
-
-        if delivery_status in ["Delivered", "Failed"]:
-            delivered_time = pickup_time + timedelta(minutes=int(actual_delivery))
-        else:
-            delivered_time = None
-            actual_delivery = None
-
-        # ── On-time and SLA breach flags ────────────────────────
-        # Two components:
-        # 1. Pure distance/time calculation (actual_delivery vs sla)
-        # 2. Warehouse-specific SLA failure bias (access restrictions,
-        #    parking, local knowledge gaps)
-        # NYC has 20% additional failure risk even when delivery time
-        # looks fine on paper — reflects real urban delivery challenges.
-        on_time_flag = None
-        sla_breach_flag = None
-        if delivery_status == "Delivered" and actual_delivery is not None:
-            time_based_breach = actual_delivery > sla
-            # Apply warehouse-specific additional failure probability
-            sla_bias = WAREHOUSE_SLA_FAILURE_BIAS.get(wh_id, 0.0)
-            bias_breach = rng.random() < sla_bias
-            # SLA breach if either time-based or bias-based
-            sla_breach_flag = time_based_breach or bias_breach
-            on_time_flag = not sla_breach_flag
-
-        # Delivery cost
-        delivery_cost = calculate_delivery_cost(distance_km)
-
-        now = datetime.combine(current_date, datetime.min.time())
-
-        rows.append(
-            {
-                "delivery_id": delivery_id,
-                "order_id": order["order_id"],
-                "driver_id": driver_id,
-                "warehouse_id": wh_id,
-                "assigned_time": assigned_time,
-                "pickup_time": pickup_time,
-                "delivered_time": delivered_time,
-                "estimated_eta_minutes": estimated_eta,
-                "actual_delivery_minutes": actual_delivery,
-                "distance_km": distance_km,
-                "delivery_cost": delivery_cost,
-                "delivery_status": delivery_status,
-                "on_time_flag": on_time_flag,
-                "sla_minutes": sla,
-                "sla_breach_flag": sla_breach_flag,
-                "created_at": now,
-                "updated_at": now,
-                "batch_id": batch_id,
-            }
-        )
-        delivery_counter += 1
-
-    return pd.DataFrame(rows), delivery_counter
+    n = len(active_orders)
+
+    # Customer location (fallback: NYC area)
+    customer_index, customer_lat, customer_lon = _customer_coords(customers_df)
+    cust_pos = customer_index.get_indexer(active_orders["customer_id"])
+    known = cust_pos >= 0
+    cust_lat = np.where(known, customer_lat[cust_pos], 40.0)
+    cust_lon = np.where(known, customer_lon[cust_pos], -74.0)
+
+    wh_ids = active_orders["assigned_warehouse_id"].to_numpy()
+    wh_codes = _WAREHOUSE_INDEX.get_indexer(wh_ids)
+    if (wh_codes < 0).any():
+        raise KeyError(f"Unknown warehouse id(s): {sorted(set(wh_ids[wh_codes < 0]))}")
+
+    # Distance with warehouse-specific road factor
+    distance_km = get_delivery_distances(wh_codes, cust_lat, cust_lon)
+    distance_factor = _DISTANCE_FACTOR[wh_codes]
+
+    driver_pool, speed_pool, pool_start, pool_size = _driver_pools(drivers_df)
+
+    # Assign driver (round-robin within warehouse): the k-th order of a
+    # warehouse goes to driver k mod pool size
+    slot = active_orders.groupby("assigned_warehouse_id", sort=False).cumcount().to_numpy()
+    pool_pos = pool_start[wh_codes] + slot % pool_size[wh_codes]
+    driver_ids = driver_pool[pool_pos]
+
+    # Driver speed from the same pool position (no per-order lookup)
+    avg_speed = speed_pool[pool_pos]
+
+    # Estimated ETA with warehouse distance factor
+    handling_minutes = rng.uniform(5, 20, size=n)
+    estimated_eta = np.round((distance_km / avg_speed) * 60 * distance_factor + handling_minutes, 2)
+
+    # ── Warehouse-specific ETA variability ──────────────────
+    # NYC (std=0.35) is highly unpredictable due to traffic/parking.
+    # Denver (std=0.10) is very consistent in suburban environment.
+    # This creates realistic variance in actual_delivery_minutes
+    # that directly drives on_time_flag and sla_breach_flag differences
+    # across warehouses — no post-processing needed for future data.
+    variability = np.clip(rng.normal(1.0, _CONGESTION_STD[wh_codes]), 0.6, 2.0)  # clip to reasonable range
+    actual_delivery = np.round(estimated_eta * variability, 2)
+
+    # SLA based on priority (hash lookup into the code table, then one take)
+    priority_codes = _PRIORITY_INDEX.get_indexer(active_orders["order_priority"])
+    if (priority_codes < 0).any():
+        unknown = active_orders["order_priority"].to_numpy()[priority_codes < 0]
+        raise KeyError(f"Unknown order priority(s): {sorted(set(unknown))}")
+    sla = SLA_MINUTES_ARR[priority_codes]
+
+    # Delivery status as codes into _DELIVERY_STATUSES: Delivered stays Delivered,
+    # Shipped is 40% Delivered / 60% In Transit, everything else is Assigned
+    order_status = active_orders["order_status"].to_numpy()
+    shipped = order_status == "Shipped"
+    shipped_delivered = rng.random(n) < 0.4
+    status_code = np.select(
+        [order_status == "Delivered", shipped & shipped_delivered, shipped],
+        [_DELIVERED, _DELIVERED, _IN_TRANSIT],
+        default=_ASSIGNED,
+    )
+
+    # Failed deliveries (~4%)
+    failed = (status_code == _DELIVERED) & (rng.random(n) < 0.04)
+    status_code[failed] = _FAILED
+    delivered = status_code == _DELIVERED
+    completed = delivered | failed
+    delivery_status = _DELIVERY_STATUSES[status_code]
+
+    # Timestamps: datetime64[ns] arrays plus whole-minute timedelta64 offsets;
+    # rows that never completed are blanked in place
+    order_ts = active_orders["order_timestamp"].to_numpy(dtype="datetime64[ns]")
+    assigned_time = order_ts + rng.integers(5, 30, size=n).astype("timedelta64[m]")
+    pickup_time = assigned_time + rng.integers(10, 45, size=n).astype("timedelta64[m]")
+    delivered_time = pickup_time + actual_delivery.astype(np.int64).astype("timedelta64[m]")
+    not_completed = ~completed
+    delivered_time[not_completed] = np.datetime64("NaT")
+    actual_delivery[not_completed] = np.nan
+
+    # ── On-time and SLA breach flags ────────────────────────
+    # Two components:
+    # 1. Pure distance/time calculation (actual_delivery vs sla)
+    # 2. Warehouse-specific SLA failure bias (access restrictions,
+    #    parking, local knowledge gaps)
+    # NYC has 20% additional failure risk even when delivery time
+    # looks fine on paper — reflects real urban delivery challenges.
+    # Both flags are only set for Delivered rows.
+    time_based_breach = actual_delivery > sla
+    bias_breach = rng.random(n) < _SLA_FAILURE_BIAS[wh_codes]
+    sla_breach = time_based_breach | bias_breach
+    # Nullable "boolean" columns: bool values plus a mask (True = missing) for
+    # rows that were not delivered, instead of object arrays holding None
+    not_delivered = ~delivered
+    sla_breach_flag = pd.arrays.BooleanArray(sla_breach, not_delivered)
+    on_time_flag = pd.arrays.BooleanArray(~sla_breach, not_delivered.copy())
+
+    # Delivery cost
+    delivery_cost = calculate_delivery_cost(distance_km)
+
+    delivery_ids = sequence_ids(f"DEL-{date_str}-", delivery_counter, n, 5)
+
+    # Every column is an array created above (or taken from the filtered
+    # active_orders copy), so the frame can take ownership without copying
+    deliveries_df = pd.DataFrame(
+        {
+            "delivery_id": delivery_ids,
+            "order_id": active_orders["order_id"].to_numpy(),
+            "driver_id": driver_ids,
+            "warehouse_id": wh_ids,
+            "assigned_time": assigned_time,
+            "pickup_time": pickup_time,
+            "delivered_time": delivered_time,
+            "estimated_eta_minutes": estimated_eta,
+            "actual_delivery_minutes": actual_delivery,
+            "distance_km": distance_km,
+            "delivery_cost": delivery_cost,
+            "delivery_status": delivery_status,
+            "on_time_flag": on_time_flag,
+            "sla_minutes": sla,
+            "sla_breach_flag": sla_breach_flag,
+            "created_at": day_start,
+            "updated_at": day_start,
+            "batch_id": batch_id,
+        },
+        copy=False,
+    )
+
+    return deliveries_df, delivery_counter + n
@@ -5,7 +5,10 @@ Generates: dim_product, dim_warehouse, dim_supplier, dim_driver,
 """
 # core/dimensions.py
 
+import calendar
 from datetime import date, datetime, timedelta
+from functools import cache, wraps
+from typing import TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
@@ -16,8 +19,10 @@ from config.constants import (
     CATEGORY_LEAD_TIME_RANGES,
     CATEGORY_PRICE_RANGES,
     CATEGORY_WEIGHT_RANGES,
-    CUSTOMER_SEGMENTS,
-    DRIVER_STATUS_DISTRIBUTION,
+    CUSTOMER_SEGMENT_CDF,
+    CUSTOMER_SEGMENT_KEYS,
+    DRIVER_STATUS_CDF,
+    DRIVER_STATUS_KEYS,
     EXPERIMENT_CONFIGS,
     MARKUP_RANGE,
     NUM_CUSTOMERS,
@@ -28,304 +33,398 @@ from config.constants import (
     SAFETY_STOCK_RANGE,
     SEGMENT_FREQUENCY_RANGES,
     SUPPLIER_CONFIGS,
-    US_HOLIDAYS,
-    VEHICLE_TYPES,
+    US_HOLIDAY_KEYS,
+    VEHICLE_CAPACITY_ARR,
+    VEHICLE_SPEED_ARR,
+    VEHICLE_TYPE_CDF,
+    VEHICLE_TYPE_KEYS,
+    sample_category,
 )
 from config.warehouse_config import (
     DRIVERS_PER_WAREHOUSE,
     WAREHOUSE_IDS,
+    WAREHOUSE_LAT,
+    WAREHOUSE_LON,
+    WAREHOUSE_REGION_ARR,
     WAREHOUSES,
 )
-from data_simulation.utils.geo import REGIONAL_CITIES, generate_customer_location
+from data_simulation.utils.geo import REGIONAL_CITIES
+from data_simulation.utils.ids import sequence_ids
+
+# Driver name pools (dim_driver)
+FIRST_NAMES = (
+    "James",
+    "Mary",
+    "John",
+    "Patricia",
+    "Robert",
+    "Jennifer",
+    "Michael",
+    "Linda",
+    "David",
+    "Elizabeth",
+    "William",
+    "Barbara",
+    "Richard",
+    "Susan",
+    "Joseph",
+    "Jessica",
+    "Thomas",
+    "Sarah",
+    "Carlos",
+    "Maria",
+    "Wei",
+    "Li",
+    "Ahmed",
+    "Fatima",
+    "Raj",
+    "Priya",
+    "Kenji",
+    "Yuki",
+    "Olga",
+    "Ivan",
+)
+LAST_NAMES = (
+    "Smith",
+    "Johnson",
+    "Williams",
+    "Brown",
+    "Jones",
+    "Garcia",
+    "Miller",
+    "Davis",
+    "Rodriguez",
+    "Martinez",
+    "Hernandez",
+    "Lopez",
+    "Wilson",
+    "Anderson",
+    "Thomas",
+    "Taylor",
+    "Moore",
+    "Jackson",
+    "Lee",
+    "Kim",
+    "Chen",
+    "Wang",
+    "Patel",
+    "Singh",
+    "Tanaka",
+    "Sato",
+    "Petrov",
+    "Ivanov",
+    "Park",
+    "Nguyen",
+)
 
+# ── Categorical dtypes for repeated labels ───────────────────
+# Dimension labels come from small fixed sets, so they are stored as
+# categoricals (int8 codes) rather than one Python string per row. Every value
+# the SCD updates write (On Leave, Van/Truck, Regular/Premium) is already a
+# category, and CSV output is unchanged.
+_CATEGORY_DTYPE = pd.CategoricalDtype(list(PRODUCT_CATEGORIES))
+_SUBCATEGORY_DTYPE = pd.CategoricalDtype(
+    list(dict.fromkeys(sub for subs in PRODUCT_CATEGORIES.values() for sub in subs))
+)
+_VEHICLE_TYPE_DTYPE = pd.CategoricalDtype(VEHICLE_TYPE_KEYS)
+_DRIVER_STATUS_DTYPE = pd.CategoricalDtype(DRIVER_STATUS_KEYS)
+_WAREHOUSE_ID_DTYPE = pd.CategoricalDtype(WAREHOUSE_IDS)
+_REGION_DTYPE = pd.CategoricalDtype(list(dict.fromkeys(WAREHOUSE_REGION_ARR)))
+_SEGMENT_DTYPE = pd.CategoricalDtype(CUSTOMER_SEGMENT_KEYS)
+_DAY_NAME_DTYPE = pd.CategoricalDtype(list(calendar.day_name))  # Monday first, as dayofweek
+_MONTH_NAME_DTYPE = pd.CategoricalDtype(list(calendar.month_name)[1:])
+_SEASON_DTYPE = pd.CategoricalDtype(["Winter", "Spring", "Summer", "Fall"])
 
-def generate_dim_product(rng: np.random.Generator) -> pd.DataFrame:
-    """Generate dim_product: 500 products across 8 categories."""
-    rows = []
-    product_counter = 1
-
-    for category, count in PRODUCTS_PER_CATEGORY.items():
-        subcategories = PRODUCT_CATEGORIES[category]
-        price_min, price_max = CATEGORY_PRICE_RANGES[category]
-        weight_min, weight_max = CATEGORY_WEIGHT_RANGES[category]
-        lead_min, lead_max = CATEGORY_LEAD_TIME_RANGES[category]
-
-        for i in range(count):
-            product_id = f"PROD-{product_counter:04d}"
-            subcategory = rng.choice(subcategories)
-
-            cost_price = round(rng.uniform(price_min, price_max), 2)
-            markup = rng.uniform(*MARKUP_RANGE)
-            selling_price = round(cost_price * markup, 2)
-
-            weight_kg = round(rng.uniform(weight_min, weight_max), 2)
-            lead_time_days = int(rng.integers(lead_min, lead_max + 1))
-            reorder_point = int(rng.integers(*REORDER_POINT_RANGE))
-            safety_stock = int(rng.integers(*SAFETY_STOCK_RANGE))
-            is_perishable = category in PERISHABLE_CATEGORIES
-
-            rows.append(
-                {
-                    "product_id": product_id,
-                    "product_name": f"{subcategory} {category[0]}-{product_counter:03d}",
-                    "category": category,
-                    "subcategory": subcategory,
-                    "cost_price": cost_price,
-                    "selling_price": selling_price,
-                    "weight_kg": weight_kg,
-                    "lead_time_days": lead_time_days,
-                    "reorder_point": reorder_point,
-                    "safety_stock": safety_stock,
-                    "is_perishable": is_perishable,
-                    "created_at": datetime(2022, 1, 1),
-                }
-            )
-            product_counter += 1
-
-    return pd.DataFrame(rows)
-
-
-def generate_dim_warehouse() -> pd.DataFrame:
-    """Generate dim_warehouse: 8 warehouses."""
-    rows = []
-    for w in WAREHOUSES:
-        rows.append(
-            {
-                "warehouse_id": w["warehouse_id"],
-                "warehouse_name": w["warehouse_name"],
-                "region": w["region"],
-                "city": w["city"],
-                "state": w["state"],
-                "latitude": w["latitude"],
-                "longitude": w["longitude"],
-                "capacity_units": w["capacity_units"],
-                "operating_cost_per_day": w["operating_cost_per_day"],
-                "is_active": True,
-            }
-        )
-    return pd.DataFrame(rows)
+# dim_date season code (into _SEASON_DTYPE) indexed by month number (0 unused)
+_SEASON_BY_MONTH = np.array([-1, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0], dtype=np.int8)
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+def _cached_frame(builder):
+    """
+    Memoize a seedless dimension builder for the life of the process
+    (repeat backfills, warm Lambda containers, tests).
+    Each call returns a copy so callers can modify their frame freely.
+    """
+    cached = cache(builder)
+
+    @wraps(builder)
+    def wrapper() -> pd.DataFrame:
+        return cached().copy()
+
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
 
 
+def generate_dim_product(rng: np.random.Generator) -> pd.DataFrame:
+    """
+    Generate dim_product: 500 products across 8 categories.
+    The extension backfill and the Lambda regenerate this table from RANDOM_SEED
+    and must get the rows already loaded in Snowflake, so draws stay per product
+    in their original order; everything around them is built by column.
+    """
+    category = []
+    subcategory = []
+    cost_price = []
+    selling_price = []
+    weight_kg = []
+    lead_time_days = []
+    reorder_point = []
+    safety_stock = []
+
+    # Bound once; uniform(lo, hi) is computed as lo + (hi - lo) * random(),
+    # which is the same arithmetic on the same draw
+    integers = rng.integers
+    random = rng.random
+    markup_min, markup_max = MARKUP_RANGE
+    markup_span = markup_max - markup_min
+
+    for cat, count in PRODUCTS_PER_CATEGORY.items():
+        subcategories = PRODUCT_CATEGORIES[cat]
+        n_sub = len(subcategories)
+        price_min, price_max = CATEGORY_PRICE_RANGES[cat]
+        price_span = price_max - price_min
+        weight_min, weight_max = CATEGORY_WEIGHT_RANGES[cat]
+        weight_span = weight_max - weight_min
+        lead_min, lead_max = CATEGORY_LEAD_TIME_RANGES[cat]
+        category.extend([cat] * count)
+
+        for _ in range(count):
+            # subcategories[integers(0, n)] draws exactly what rng.choice(subcategories) did
+            subcategory.append(subcategories[integers(0, n_sub)])
+            cost = round(price_min + price_span * random(), 2)
+            markup = markup_min + markup_span * random()
+            cost_price.append(cost)
+            selling_price.append(round(cost * markup, 2))
+            weight_kg.append(round(weight_min + weight_span * random(), 2))
+            lead_time_days.append(int(integers(lead_min, lead_max + 1)))
+            reorder_point.append(int(integers(*REORDER_POINT_RANGE)))
+            safety_stock.append(int(integers(*SAFETY_STOCK_RANGE)))
+
+    number = range(1, len(category) + 1)
+    category = np.array(category, dtype=object)
+
+    return pd.DataFrame(
+        {
+            "product_id": sequence_ids("PROD-", 1, len(category), 4),
+            "product_name": [f"{sub} {cat[0]}-{n:03d}" for sub, cat, n in zip(subcategory, category, number)],
+            "category": pd.Categorical(category, dtype=_CATEGORY_DTYPE),
+            "subcategory": pd.Categorical(subcategory, dtype=_SUBCATEGORY_DTYPE),
+            "cost_price": cost_price,
+            "selling_price": selling_price,
+            "weight_kg": weight_kg,
+            "lead_time_days": lead_time_days,
+            "reorder_point": reorder_point,
+            "safety_stock": safety_stock,
+            "is_perishable": np.isin(category, list(PERISHABLE_CATEGORIES)),
+            "created_at": np.datetime64(datetime(2022, 1, 1), "ns"),
+        }
+    )
+
+
+@cache
+def generate_dim_warehouse() -> "pa.Table":
+    """
+    Generate dim_warehouse: 8 warehouses.
+    Pure static config, so it is built straight into an Arrow table (no pandas
+    round-trip) with dictionary-encoded ID/region columns. Arrow tables are
+    immutable, so the cached table is shared as-is.
+    """
+    # Imported here: only the local backfill writes dim_warehouse, and the Lambda
+    # package that also imports this module does not bundle pyarrow
+    import pyarrow as pa
+
+    schema = pa.schema(
+        [
+            pa.field("warehouse_id", pa.dictionary(pa.int8(), pa.string())),
+            pa.field("warehouse_name", pa.string()),
+            pa.field("region", pa.dictionary(pa.int8(), pa.string())),
+            pa.field("city", pa.string()),
+            pa.field("state", pa.dictionary(pa.int8(), pa.string())),
+            pa.field("latitude", pa.float64()),
+            pa.field("longitude", pa.float64()),
+            pa.field("capacity_units", pa.int64()),
+            pa.field("operating_cost_per_day", pa.float64()),
+            pa.field("is_active", pa.bool_()),
+        ]
+    )
+    rows = [{**{name: w[name] for name in schema.names[:-1]}, "is_active": True} for w in WAREHOUSES]
+    return pa.Table.from_pylist(rows, schema=schema)
+
+
+@_cached_frame
 def generate_dim_supplier() -> pd.DataFrame:
     """Generate dim_supplier: 6 suppliers."""
-    rows = []
-    for i, s in enumerate(SUPPLIER_CONFIGS):
-        rows.append(
-            {
-                "supplier_id": f"SUP-{i + 1:03d}",
-                "supplier_name": s["name"],
-                "region": s["region"],
-                "average_lead_time": s["lead_time"],
-                "lead_time_std_dev": s["std_dev"],
-                "reliability_score": s["reliability"],
-                "product_categories": s["categories"],
-            }
-        )
-    return pd.DataFrame(rows)
+    return pd.DataFrame(
+        {
+            "supplier_id": [f"SUP-{i:03d}" for i in range(1, len(SUPPLIER_CONFIGS) + 1)],
+            "supplier_name": [s["name"] for s in SUPPLIER_CONFIGS],
+            "region": [s["region"] for s in SUPPLIER_CONFIGS],
+            "average_lead_time": [s["lead_time"] for s in SUPPLIER_CONFIGS],
+            "lead_time_std_dev": [s["std_dev"] for s in SUPPLIER_CONFIGS],
+            "reliability_score": [s["reliability"] for s in SUPPLIER_CONFIGS],
+            "product_categories": [s["categories"] for s in SUPPLIER_CONFIGS],
+        }
+    )
 
 
 def generate_dim_driver(rng: np.random.Generator) -> pd.DataFrame:
-    """Generate dim_driver: ~300 drivers across 8 warehouses."""
-    rows = []
-    driver_counter = 1
-
-    # Build vehicle type choices and their probabilities
-    v_types = list(VEHICLE_TYPES.keys())
-    v_probs = [VEHICLE_TYPES[v]["proportion"] for v in v_types]
-
-    # Build status choices
-    statuses = list(DRIVER_STATUS_DISTRIBUTION.keys())
-    status_probs = list(DRIVER_STATUS_DISTRIBUTION.values())
-
-    for wh_id in WAREHOUSE_IDS:
-        num_drivers = DRIVERS_PER_WAREHOUSE[wh_id]
-
-        for _ in range(num_drivers):
-            driver_id = f"DRV-{driver_counter:04d}"
-            vehicle = rng.choice(v_types, p=v_probs)
-
-            cap_min, cap_max = VEHICLE_TYPES[vehicle]["capacity"]
-            spd_min, spd_max = VEHICLE_TYPES[vehicle]["speed"]
-
-            status = rng.choice(statuses, p=status_probs)
-
-            # Hire date: between 2019 and 2023
-            days_offset = int(rng.integers(0, 365 * 4))
-            hire_date = date(2019, 1, 1) + timedelta(days=days_offset)
-
-            first_names = [
-                "James",
-                "Mary",
-                "John",
-                "Patricia",
-                "Robert",
-                "Jennifer",
-                "Michael",
-                "Linda",
-                "David",
-                "Elizabeth",
-                "William",
-                "Barbara",
-                "Richard",
-                "Susan",
-                "Joseph",
-                "Jessica",
-                "Thomas",
-                "Sarah",
-                "Carlos",
-                "Maria",
-                "Wei",
-                "Li",
-                "Ahmed",
-                "Fatima",
-                "Raj",
-                "Priya",
-                "Kenji",
-                "Yuki",
-                "Olga",
-                "Ivan",
-            ]
-            last_names = [
-                "Smith",
-                "Johnson",
-                "Williams",
-                "Brown",
-                "Jones",
-                "Garcia",
-                "Miller",
-                "Davis",
-                "Rodriguez",
-                "Martinez",
-                "Hernandez",
-                "Lopez",
-                "Wilson",
-                "Anderson",
-                "Thomas",
-                "Taylor",
-                "Moore",
-                "Jackson",
-                "Lee",
-                "Kim",
-                "Chen",
-                "Wang",
-                "Patel",
-                "Singh",
-                "Tanaka",
-                "Sato",
-                "Petrov",
-                "Ivanov",
-                "Park",
-                "Nguyen",
-            ]
-
-            driver_name = f"{rng.choice(first_names)} {rng.choice(last_names)}"
-
-            rows.append(
-                {
-                    "driver_id": driver_id,
-                    "warehouse_id": wh_id,
-                    "driver_name": driver_name,
-                    "vehicle_type": vehicle,
-                    "max_delivery_capacity": int(rng.integers(cap_min, cap_max + 1)),
-                    "avg_speed_kmh": round(rng.uniform(spd_min, spd_max), 2),
-                    "availability_status": status,
-                    "hire_date": hire_date,
-                }
-            )
-            driver_counter += 1
-
-    return pd.DataFrame(rows)
+    """
+    Generate dim_driver: ~300 drivers across 8 warehouses.
+    Like dim_product, the table is regenerated from RANDOM_SEED by the extension
+    and the Lambda, so each driver's draws keep their original order.
+    """
+    num_drivers = sum(DRIVERS_PER_WAREHOUSE[wh_id] for wh_id in WAREHOUSE_IDS)
+    vehicle_code = np.empty(num_drivers, dtype=np.int64)
+    status_code = np.empty(num_drivers, dtype=np.int64)
+    hire_offset = np.empty(num_drivers, dtype=np.int64)
+    driver_name = []
+    capacity = []
+    avg_speed = []
+
+    integers = rng.integers
+    random = rng.random
+    n_first = len(FIRST_NAMES)
+    n_last = len(LAST_NAMES)
+
+    for i in range(num_drivers):
+        # sample_category / names[integers(0, n)] consume the same draws as
+        # rng.choice(keys, p=probs) / rng.choice(names) did
+        vehicle = int(sample_category(rng, VEHICLE_TYPE_CDF))
+        vehicle_code[i] = vehicle
+        status_code[i] = sample_category(rng, DRIVER_STATUS_CDF)
+
+        # Hire date: between 2019 and 2023
+        hire_offset[i] = integers(0, 365 * 4)
+
+        driver_name.append(f"{FIRST_NAMES[integers(0, n_first)]} {LAST_NAMES[integers(0, n_last)]}")
+
+        cap_min, cap_max = VEHICLE_CAPACITY_ARR[vehicle]
+        spd_min, spd_max = VEHICLE_SPEED_ARR[vehicle]
+        capacity.append(int(integers(cap_min, cap_max + 1)))
+        avg_speed.append(round(spd_min + (spd_max - spd_min) * random(), 2))
+
+    hire_date = np.datetime64(date(2019, 1, 1), "D") + hire_offset.astype("timedelta64[D]")
+
+    return pd.DataFrame(
+        {
+            "driver_id": sequence_ids("DRV-", 1, num_drivers, 4),
+            "warehouse_id": pd.Categorical.from_codes(
+                np.repeat(np.arange(len(WAREHOUSE_IDS)), [DRIVERS_PER_WAREHOUSE[wh_id] for wh_id in WAREHOUSE_IDS]),
+                dtype=_WAREHOUSE_ID_DTYPE,
+            ),
+            "driver_name": driver_name,
+            "vehicle_type": pd.Categorical.from_codes(vehicle_code, dtype=_VEHICLE_TYPE_DTYPE),
+            "max_delivery_capacity": capacity,
+            "avg_speed_kmh": avg_speed,
+            "availability_status": pd.Categorical.from_codes(status_code, dtype=_DRIVER_STATUS_DTYPE),
+            "hire_date": hire_date.astype(object),
+        }
+    )
 
 
 def generate_dim_customer(rng: np.random.Generator) -> pd.DataFrame:
-    """Generate dim_customer: ~10,000 customers."""
-    rows = []
-
-    segments = list(CUSTOMER_SEGMENTS.keys())
-    segment_probs = list(CUSTOMER_SEGMENTS.values())
+    """
+    Generate dim_customer: ~10,000 customers.
+    Regenerated from RANDOM_SEED by the extension and the Lambda (customer IDs and
+    coordinates must match the loaded rows), so each customer's draws keep their
+    original order; lookups and the frame itself are built by column.
+    """
+    wh_code = np.empty(NUM_CUSTOMERS, dtype=np.int64)
+    segment_code = np.empty(NUM_CUSTOMERS, dtype=np.int64)
+    acquisition_offset = np.empty(NUM_CUSTOMERS, dtype=np.int64)
+    city = []
+    frequency_score = []
+    latitude = []
+    longitude = []
+
+    integers = rng.integers
+    random = rng.random
+    n_warehouses = len(WAREHOUSE_IDS)
+    cities = [REGIONAL_CITIES[wh_id] for wh_id in WAREHOUSE_IDS]
+    freq_ranges = [SEGMENT_FREQUENCY_RANGES[segment] for segment in CUSTOMER_SEGMENT_KEYS]
+    wh_lat = WAREHOUSE_LAT.tolist()
+    wh_lon = WAREHOUSE_LON.tolist()
 
     for i in range(NUM_CUSTOMERS):
-        customer_id = f"CUST-{i + 1:05d}"
-
-        # Assign customer to a region (warehouse)
-        assigned_wh = rng.choice(WAREHOUSE_IDS)
-        region = next(w["region"] for w in WAREHOUSES if w["warehouse_id"] == assigned_wh)
-        city = rng.choice(REGIONAL_CITIES[assigned_wh])
+        # Assign customer to a region (warehouse); integers(0, n) and
+        # list[integers(0, n)] draw what rng.choice(n) / rng.choice(list) did
+        wh = int(integers(0, n_warehouses))
+        wh_code[i] = wh
+        wh_cities = cities[wh]
+        city.append(wh_cities[integers(0, len(wh_cities))])
 
         # Customer segment
-        segment = rng.choice(segments, p=segment_probs)
-        freq_min, freq_max = SEGMENT_FREQUENCY_RANGES[segment]
-        frequency_score = round(rng.uniform(freq_min, freq_max), 2)
+        segment = int(sample_category(rng, CUSTOMER_SEGMENT_CDF))
+        segment_code[i] = segment
+        freq_min, freq_max = freq_ranges[segment]
+        frequency_score.append(round(freq_min + (freq_max - freq_min) * random(), 2))
 
         # Acquisition date: between 2020 and 2024
-        days_offset = int(rng.integers(0, 365 * 4))
-        acquisition_date = date(2020, 1, 1) + timedelta(days=days_offset)
-
-        # Location near assigned warehouse
-        lat, lon = generate_customer_location(assigned_wh, rng)
-
-        rows.append(
-            {
-                "customer_id": customer_id,
-                "region": region,
-                "city": city,
-                "customer_segment": segment,
-                "order_frequency_score": frequency_score,
-                "acquisition_date": acquisition_date,
-                "latitude": lat,
-                "longitude": lon,
-            }
-        )
-
-    return pd.DataFrame(rows)
-
-
+        acquisition_offset[i] = integers(0, 365 * 4)
+
+        # Location near assigned warehouse: the draws and rounding of
+        # generate_customer_location, with the clamp applied to the whole column below
+        latitude.append(round(wh_lat[wh] + (-0.3 + 0.6 * random()), 6))
+        longitude.append(round(wh_lon[wh] + (-0.3 + 0.6 * random()), 6))
+
+    acquisition_date = np.datetime64(date(2020, 1, 1), "D") + acquisition_offset.astype("timedelta64[D]")
+
+    return pd.DataFrame(
+        {
+            "customer_id": sequence_ids("CUST-", 1, NUM_CUSTOMERS, 5),
+            "region": pd.Categorical(WAREHOUSE_REGION_ARR[wh_code], dtype=_REGION_DTYPE),
+            "city": city,
+            "customer_segment": pd.Categorical.from_codes(segment_code, dtype=_SEGMENT_DTYPE),
+            "order_frequency_score": frequency_score,
+            "acquisition_date": acquisition_date.astype(object),
+            # Clamp to valid US coordinates
+            "latitude": np.clip(latitude, 24.5, 49.0),
+            "longitude": np.clip(longitude, -125.0, -66.0),
+        }
+    )
+
+
+def build_dim_date(start_date: date, end_date: date) -> pd.DataFrame:
+    """
+    Build dim_date rows for every day from start_date to end_date (inclusive).
+    Columns are computed over one pd.date_range; holidays are (month, day) pairs
+    matched against US_HOLIDAY_KEYS as month * 100 + day.
+    """
+    idx = pd.date_range(start_date, end_date, freq="D")
+    month = idx.month.to_numpy(dtype=np.int64)
+    day_of_week = idx.dayofweek.to_numpy(dtype=np.int64)
+    day_of_week_num = day_of_week + 1  # ISO: Monday=1 … Sunday=7
+
+    return pd.DataFrame(
+        {
+            "date": idx.date,
+            "day_of_week": pd.Categorical.from_codes(day_of_week, dtype=_DAY_NAME_DTYPE),
+            "day_of_week_num": day_of_week_num,
+            "week_number": idx.isocalendar().week.to_numpy(dtype=np.int64),
+            "month": month,
+            "month_name": pd.Categorical.from_codes(month - 1, dtype=_MONTH_NAME_DTYPE),
+            "quarter": idx.quarter.to_numpy(dtype=np.int64),
+            "year": idx.year.to_numpy(dtype=np.int64),
+            "is_holiday": np.isin(month * 100 + idx.day.to_numpy(), US_HOLIDAY_KEYS),
+            "is_weekend": day_of_week_num >= 6,
+            "season": pd.Categorical.from_codes(_SEASON_BY_MONTH[month], dtype=_SEASON_DTYPE),
+        },
+        copy=False,
+    )
+
+
+@_cached_frame
 def generate_dim_date() -> pd.DataFrame:
     """Generate dim_date: one row per day for the backfill period."""
-    rows = []
-    current = BACKFILL_START_DATE
-    end = BACKFILL_END_DATE
-
-    while current <= end:
-        month = current.month
-
-        # Determine season
-        if month in (3, 4, 5):
-            season = "Spring"
-        elif month in (6, 7, 8):
-            season = "Summer"
-        elif month in (9, 10, 11):
-            season = "Fall"
-        else:
-            season = "Winter"
-
-        # Check holiday
-        is_holiday = (month, current.day) in US_HOLIDAYS
-
-        rows.append(
-            {
-                "date": current,
-                "day_of_week": current.strftime("%A"),
-                "day_of_week_num": current.isoweekday(),
-                "week_number": current.isocalendar()[1],
-                "month": month,
-                "month_name": current.strftime("%B"),
-                "quarter": (month - 1) // 3 + 1,
-                "year": current.year,
-                "is_holiday": is_holiday,
-                "is_weekend": current.isoweekday() >= 6,
-                "season": season,
-            }
-        )
-        current += timedelta(days=1)
-
-    return pd.DataFrame(rows)
+    return build_dim_date(BACKFILL_START_DATE, BACKFILL_END_DATE)
 
 
+@_cached_frame
 def generate_dim_experiments() -> pd.DataFrame:
     """Generate dim_experiments: ~10 experiments."""
-    rows = []
-
     # Spread experiments across the 3-year period
     experiment_starts = [
         date(2022, 6, 1),
@@ -338,30 +437,25 @@ def generate_dim_experiments() -> pd.DataFrame:
         date(2024, 4, 1),
         date(2024, 7, 1),
         date(2024, 10, 1),
-    ]
-
-    for i, config in enumerate(EXPERIMENT_CONFIGS):
-        start = experiment_starts[i]
-        # Most experiments run 90 days, last 2 are still active
-        if i < 8:
-            end = start + timedelta(days=90)
-            status = "Completed"
-        else:
-            end = None
-            status = "Active"
-
-        rows.append(
-            {
-                "experiment_id": f"EXP-{i + 1:03d}",
-                "experiment_name": config["name"],
-                "strategy_name": config["strategy"],
-                "experiment_type": config["type"],
-                "description": f"Testing {config['strategy']} strategy across target warehouses.",
-                "start_date": start,
-                "end_date": end,
-                "target_warehouses": config["warehouses"],
-                "status": status,
-            }
-        )
-
-    return pd.DataFrame(rows)
+    ][: len(EXPERIMENT_CONFIGS)]
+
+    # Most experiments run 90 days, last 2 are still active
+    completed = [i < 8 for i in range(len(EXPERIMENT_CONFIGS))]
+
+    return pd.DataFrame(
+        {
+            "experiment_id": [f"EXP-{i:03d}" for i in range(1, len(EXPERIMENT_CONFIGS) + 1)],
+            "experiment_name": [config["name"] for config in EXPERIMENT_CONFIGS],
+            "strategy_name": [config["strategy"] for config in EXPERIMENT_CONFIGS],
+            "experiment_type": [config["type"] for config in EXPERIMENT_CONFIGS],
+            "description": [
+                f"Testing {config['strategy']} strategy across target warehouses." for config in EXPERIMENT_CONFIGS
+            ],
+            "start_date": experiment_starts,
+            "end_date": [
+                start + timedelta(days=90) if done else None for start, done in zip(experiment_starts, completed)
+            ],
+            "target_warehouses": [config["warehouses"] for config in EXPERIMENT_CONFIGS],
+            "status": ["Completed" if done else "Active" for done in completed],
+        }
+    )
@@ -11,12 +11,35 @@ v2: Added warehouse-specific utilization floors via WAREHOUSE_UTILIZATION_TARGET
     realistic even on low-volume days.
 """
 
-from datetime import date, datetime
+from datetime import date
 
 import numpy as np
 import pandas as pd
 
-from config.constants import BATCH_ID_PREFIX, WAREHOUSE_UTILIZATION_TARGETS
+from config.constants import WAREHOUSE_UTILIZATION_TARGETS
+from config.warehouse_config import WAREHOUSE_IDS
+from data_simulation.utils.frame_cache import reuse_for_same_frame
+from data_simulation.utils.ids import day_stamp
+
+# Utilization target per warehouse, indexed by position in WAREHOUSE_IDS
+_UTILIZATION_TARGET = np.array([WAREHOUSE_UTILIZATION_TARGETS.get(wh_id, 0.80) for wh_id in WAREHOUSE_IDS])
+
+
+@reuse_for_same_frame
+def _active_drivers(drivers_df: pd.DataFrame) -> tuple:
+    """
+    Active drivers as (driver_id Index, warehouse_id array, speed array,
+    utilization target array), all in the same positions.
+    """
+    active = drivers_df[drivers_df["availability_status"] == "Active"]
+    wh_ids = active["warehouse_id"].to_numpy()
+    wh_codes = pd.Index(WAREHOUSE_IDS).get_indexer(wh_ids)
+    return (
+        pd.Index(active["driver_id"]),
+        wh_ids,
+        active["avg_speed_kmh"].to_numpy(dtype=np.float64),
+        np.where(wh_codes >= 0, _UTILIZATION_TARGET[wh_codes], 0.80),
+    )
 
 
 def generate_daily_driver_activity(
@@ -35,92 +58,75 @@ def generate_daily_driver_activity(
     This prevents Denver drivers from showing 10% utilization on a slow
     day when the warehouse target is 68%.
 
+    All drivers are computed together as column arrays, with each random
+    draw made once for the whole day.
+
     Returns: driver_activity_df
     """
-    batch_id = f"{BATCH_ID_PREFIX}_{current_date.strftime('%Y%m%d')}"
-    now = datetime.combine(current_date, datetime.min.time())
+    _, batch_id, now = day_stamp(current_date)
+    shift_hours = 8.0
 
     # Only active drivers work
-    active_drivers = drivers_df[drivers_df["availability_status"] == "Active"]
+    driver_index, wh_ids, avg_speed, utilization_target = _active_drivers(drivers_df)
+    n = len(driver_index)
 
-    # Aggregate deliveries per driver
-    driver_delivery_stats = {}
+    # Aggregate completed deliveries per driver by position in active_drivers
+    # (drivers with no completed deliveries get 0 / 0.0)
+    deliveries_completed = np.zeros(n, dtype=np.int64)
+    total_distance = np.zeros(n, dtype=np.float64)
     if len(deliveries_df) > 0:
         completed = deliveries_df[deliveries_df["delivery_status"].isin(["Delivered", "Failed"])]
-        if len(completed) > 0:
-            stats = (
-                completed.groupby("driver_id")
-                .agg(
-                    deliveries_completed=("delivery_id", "count"),
-                    total_distance_km=("distance_km", "sum"),
-                )
-                .to_dict("index")
-            )
-            driver_delivery_stats = stats
-
-    rows = []
-
-    for _, driver in active_drivers.iterrows():
-        driver_id = driver["driver_id"]
-        wh_id = driver["warehouse_id"]
-
-        stats = driver_delivery_stats.get(driver_id, None)
-
-        if stats:
-            deliveries_completed = stats["deliveries_completed"]
-            total_distance = round(stats["total_distance_km"], 2)
-        else:
-            deliveries_completed = 0
-            total_distance = 0.0
-
-        # Calculate time spent from deliveries
-        avg_speed = driver["avg_speed_kmh"]
-        if avg_speed > 0 and total_distance > 0:
-            driving_hours = total_distance / avg_speed
-            handling_hours = deliveries_completed * 0.25  # ~15 min per delivery
-            total_active_hours = round(min(driving_hours + handling_hours, 10.0), 2)
-        else:
-            total_active_hours = round(rng.uniform(0.5, 2.0), 2)
-
-        shift_hours = 8.0
-        idle_hours = round(max(0, shift_hours - total_active_hours), 2)
-
-        # Delivery-derived utilization
-        delivery_utilization = (total_active_hours / shift_hours) * 100
-
-        # ── Warehouse utilization floor ──────────────────────────
-        # Each warehouse has a target utilization based on demand volume.
-        # NYC drivers (target 94%) are always near capacity.
-        # Denver drivers (target 68%) have more idle time.
-        # We take the max of delivery-derived and a noisy floor to ensure
-        # realistic warehouse-level variation even on low-volume days.
-        utilization_target = WAREHOUSE_UTILIZATION_TARGETS.get(wh_id, 0.80)
-        # Add daily noise ±5% around the warehouse target
-        noisy_floor = (utilization_target + rng.uniform(-0.05, 0.05)) * 100
-        noisy_floor = max(10.0, min(99.0, noisy_floor))
-
-        # Final utilization is higher of actual work and warehouse floor
-        utilization_pct = round(max(delivery_utilization, noisy_floor * 0.7), 2)
-        utilization_pct = min(100.0, utilization_pct)
-
-        # Recalculate active hours from final utilization for consistency
-        total_active_hours = round((utilization_pct / 100) * shift_hours, 2)
-        idle_hours = round(max(0, shift_hours - total_active_hours), 2)
-
-        rows.append(
-            {
-                "driver_id": driver_id,
-                "activity_date": current_date,
-                "warehouse_id": wh_id,
-                "deliveries_completed": deliveries_completed,
-                "total_distance_km": total_distance,
-                "total_active_hours": total_active_hours,
-                "idle_hours": idle_hours,
-                "utilization_pct": utilization_pct,
-                "created_at": now,
-                "updated_at": now,
-                "batch_id": batch_id,
-            }
+        pos = driver_index.get_indexer(completed["driver_id"])
+        worked = pos >= 0
+        deliveries_completed = np.bincount(pos[worked], minlength=n)
+        total_distance = np.round(
+            np.bincount(pos[worked], weights=completed["distance_km"].to_numpy()[worked], minlength=n), 2
         )
 
-    return pd.DataFrame(rows)
+    # Calculate time spent from deliveries; drivers with no distance
+    # get a light 0.5-2.0h day instead
+    has_work = (avg_speed > 0) & (total_distance > 0)
+    worked_hours = np.minimum(
+        np.divide(total_distance, avg_speed, out=np.zeros(n), where=has_work)
+        + deliveries_completed * 0.25,  # ~15 min per delivery
+        10.0,
+    )
+    total_active_hours = np.round(np.where(has_work, worked_hours, rng.uniform(0.5, 2.0, size=n)), 2)
+
+    # Delivery-derived utilization
+    delivery_utilization = (total_active_hours / shift_hours) * 100
+
+    # ── Warehouse utilization floor ──────────────────────────
+    # Each warehouse has a target utilization based on demand volume.
+    # NYC drivers (target 94%) are always near capacity.
+    # Denver drivers (target 68%) have more idle time.
+    # We take the max of delivery-derived and a noisy floor to ensure
+    # realistic warehouse-level variation even on low-volume days.
+    # Add daily noise ±5% around the warehouse target
+    noisy_floor = np.clip((utilization_target + rng.uniform(-0.05, 0.05, size=n)) * 100, 10.0, 99.0)
+
+    # Final utilization is higher of actual work and warehouse floor
+    utilization_pct = np.minimum(np.round(np.maximum(delivery_utilization, noisy_floor * 0.7), 2), 100.0)
+
+    # Recalculate active hours from final utilization for consistency
+    total_active_hours = np.round((utilization_pct / 100) * shift_hours, 2)
+    idle_hours = np.round(np.maximum(0, shift_hours - total_active_hours), 2)
+
+    # Numeric columns are fresh arrays and are not copied again; the
+    # cached driver columns are, so no day's frame shares them
+    return pd.DataFrame(
+        {
+            "driver_id": driver_index.to_numpy(copy=True),
+            "activity_date": current_date,
+            "warehouse_id": wh_ids.copy(),
+            "deliveries_completed": deliveries_completed,
+            "total_distance_km": total_distance,
+            "total_active_hours": total_active_hours,
+            "idle_hours": idle_hours,
+            "utilization_pct": utilization_pct,
+            "created_at": now,
+            "updated_at": now,
+            "batch_id": batch_id,
+        },
+        copy=False,
+    )
@@ -4,12 +4,12 @@ Experiment assignment generation for a single day.
 Generates: fact_experiment_assignments
 """
 
-from datetime import date, datetime
+from datetime import date
 
 import numpy as np
 import pandas as pd
 
-from config.constants import BATCH_ID_PREFIX
+from data_simulation.utils.ids import day_stamp, sequence_ids
 
 
 def generate_daily_experiment_assignments(
@@ -24,8 +24,7 @@ def generate_daily_experiment_assignments(
 
     Returns: (assignments_df, updated_counter)
     """
-    batch_id = f"{BATCH_ID_PREFIX}_{current_date.strftime('%Y%m%d')}"
-    now = datetime.combine(current_date, datetime.min.time())
+    date_str, batch_id, now = day_stamp(current_date)
 
     # Filter orders that are part of experiments
     experiment_orders = orders_df[orders_df["experiment_id"].notna()]
@@ -33,24 +32,23 @@ def generate_daily_experiment_assignments(
     if len(experiment_orders) == 0:
         return pd.DataFrame(), assignment_counter
 
-    rows = []
-
-    for _, order in experiment_orders.iterrows():
-        assignment_id = f"ASG-{current_date.strftime('%Y%m%d')}-{assignment_counter:05d}"
-
-        rows.append(
-            {
-                "assignment_id": assignment_id,
-                "experiment_id": order["experiment_id"],
-                "order_id": order["order_id"],
-                "group_name": order["experiment_group"],
-                "assigned_at": order["order_timestamp"],
-                "warehouse_id": order["assigned_warehouse_id"],
-                "created_at": now,
-                "updated_at": now,
-                "batch_id": batch_id,
-            }
-        )
-        assignment_counter += 1
-
-    return pd.DataFrame(rows), assignment_counter
+    n = len(experiment_orders)
+
+    # Every column is copied straight from the filtered orders, so the frame
+    # is built from column arrays in one go
+    assignments_df = pd.DataFrame(
+        {
+            "assignment_id": sequence_ids(f"ASG-{date_str}-", assignment_counter, n, 5),
+            "experiment_id": experiment_orders["experiment_id"].to_numpy(),
+            "order_id": experiment_orders["order_id"].to_numpy(),
+            "group_name": experiment_orders["experiment_group"].to_numpy(),
+            "assigned_at": experiment_orders["order_timestamp"].to_numpy(),
+            "warehouse_id": experiment_orders["assigned_warehouse_id"].to_numpy(),
+            "created_at": now,
+            "updated_at": now,
+            "batch_id": batch_id,
+        },
+        copy=False,
+    )
+
+    return assignments_df, assignment_counter + n
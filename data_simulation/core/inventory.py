@@ -8,44 +8,85 @@ v2: Added warehouse-specific holding cost multipliers.
     without post-processing adjustments.
 """
 
-from datetime import date, datetime
-from typing import Dict, Tuple
+from datetime import date
+from typing import Tuple
 
 import numpy as np
 import pandas as pd
 
 from config.constants import (
-    BATCH_ID_PREFIX,
-    HOLDING_COST_RATE,
     INITIAL_STOCK_RANGE,
     REORDER_QUANTITY_RANGE,
     WAREHOUSE_HOLDING_COST_MULTIPLIERS,
 )
 from config.warehouse_config import WAREHOUSE_IDS
+from data_simulation.state.state_manager import INVENTORY_STATE_DTYPE
+from data_simulation.utils.cost import calculate_days_of_supply, calculate_holding_cost, calculate_inventory_value
+from data_simulation.utils.frame_cache import reuse_for_same_frame
+from data_simulation.utils.ids import day_stamp
+
+# ── Warehouse-specific holding cost multiplier ───────────
+# NYC/LA have 35-45% higher warehouse costs per sq ft than
+# Denver/Dallas due to real estate prices. This creates natural
+# holding_cost variance across warehouses in mart_daily_product_kpis
+# and mart_daily_warehouse_kpis without post-processing.
+_WH_COST_MULTIPLIER = np.array([WAREHOUSE_HOLDING_COST_MULTIPLIERS.get(wh_id, 1.0) for wh_id in WAREHOUSE_IDS])
+
+_WAREHOUSE_INDEX = pd.Index(WAREHOUSE_IDS)
+
+
+@reuse_for_same_frame
+def _product_vectors(products_df: pd.DataFrame) -> tuple:
+    """
+    Product id index plus safety stock, reorder point and cost price arrays,
+    all in dim_product row order (the column order of the inventory matrices).
+    """
+    return (
+        pd.Index(products_df["product_id"]),
+        products_df["safety_stock"].to_numpy(),
+        products_df["reorder_point"].to_numpy(),
+        products_df["cost_price"].to_numpy(),
+    )
 
 
 def initialize_inventory(
     products_df: pd.DataFrame,
     rng: np.random.Generator,
-) -> Dict[Tuple[str, str], dict]:
+) -> np.ndarray:
     """
     Create initial inventory state for day 1.
-    Returns dict keyed by (warehouse_id, product_id) with stock info.
+    Returns a (warehouse, product) structured array of INVENTORY_STATE_DTYPE.
     """
-    inventory_state = {}
+    inventory_state = np.zeros((len(WAREHOUSE_IDS), len(products_df)), dtype=INVENTORY_STATE_DTYPE)
+    inventory_state["closing_stock"] = rng.integers(*INITIAL_STOCK_RANGE, size=inventory_state.shape, dtype=np.int32)
+    return inventory_state
 
-    for wh_id in WAREHOUSE_IDS:
-        for _, product in products_df.iterrows():
-            pid = product["product_id"]
-            initial_stock = int(rng.integers(*INITIAL_STOCK_RANGE))
 
-            inventory_state[(wh_id, pid)] = {
-                "closing_stock": initial_stock,
-                "units_on_order": 0,
-                "avg_daily_demand": 0.0,
-            }
+def _aggregate_units(
+    wh_codes: np.ndarray,
+    prod_codes: np.ndarray,
+    quantities: np.ndarray,
+    n_products: int,
+) -> np.ndarray:
+    """
+    Sum quantities into a (warehouse, product) matrix.
+    Codes are positions in WAREHOUSE_IDS / dim_product; rows with a -1 code are skipped.
+    """
+    valid = (wh_codes >= 0) & (prod_codes >= 0)
+    cells = wh_codes[valid] * n_products + prod_codes[valid]
+    units = np.bincount(cells, weights=quantities[valid], minlength=len(WAREHOUSE_IDS) * n_products)
+    return units.astype(np.int64).reshape(len(WAREHOUSE_IDS), n_products)
 
-    return inventory_state
+
+@reuse_for_same_frame
+def _snapshot_keys(products_df: pd.DataFrame) -> tuple:
+    """
+    warehouse_id and product_id columns of the snapshot: the full
+    (warehouse, product) grid flattened row-major, as object arrays.
+    """
+    warehouse_col = np.repeat(np.array(WAREHOUSE_IDS, dtype=object), len(products_df))
+    product_col = np.tile(products_df["product_id"].to_numpy(dtype=object), len(WAREHOUSE_IDS))
+    return warehouse_col, product_col
 
 
 def generate_daily_inventory_snapshot(
@@ -54,119 +95,102 @@ def generate_daily_inventory_snapshot(
     orders_df: pd.DataFrame,
     order_items_df: pd.DataFrame,
     shipments_arriving: pd.DataFrame,
-    inventory_state: Dict[Tuple[str, str], dict],
+    inventory_state: np.ndarray,
     rng: np.random.Generator,
-) -> Tuple[pd.DataFrame, Dict[Tuple[str, str], dict]]:
+) -> Tuple[pd.DataFrame, np.ndarray]:
     """
     Generate fact_inventory_snapshot for a single day.
     Updates inventory_state in place and returns the snapshot DataFrame.
 
     Returns: (snapshot_df, updated_inventory_state)
     """
-    batch_id = f"{BATCH_ID_PREFIX}_{current_date.strftime('%Y%m%d')}"
-    now = datetime.combine(current_date, datetime.min.time())
+    _, batch_id, now = day_stamp(current_date)
 
-    # Calculate units sold per warehouse x product
-    units_sold_map = {}
-    if len(orders_df) > 0 and len(order_items_df) > 0:
-        merged = order_items_df.merge(orders_df[["order_id", "assigned_warehouse_id"]], on="order_id", how="left")
-        delivered_orders = orders_df[orders_df["order_status"].isin(["Delivered", "Shipped", "Processing"])]["order_id"]
-        merged = merged[merged["order_id"].isin(delivered_orders)]
+    product_index, safety_stock, reorder_point, cost_price = _product_vectors(products_df)
+    shape = (len(WAREHOUSE_IDS), len(product_index))
 
-        if len(merged) > 0:
-            sold_agg = merged.groupby(["assigned_warehouse_id", "product_id"])["quantity"].sum().to_dict()
-            units_sold_map = {(wh, pid): qty for (wh, pid), qty in sold_agg.items()}
+    # Calculate units sold and returned per warehouse x product. Each item
+    # picks up its order's warehouse/status/return flag by position in
+    # orders_df instead of through a merge.
+    units_sold = np.zeros(shape, dtype=np.int64)
+    units_returned = np.zeros(shape, dtype=np.int64)
+    if len(orders_df) > 0 and len(order_items_df) > 0:
+        order_pos = pd.Index(orders_df["order_id"]).get_indexer(order_items_df["order_id"])
+        known = order_pos >= 0
+        order_pos = order_pos[known]
+        order_wh = _WAREHOUSE_INDEX.get_indexer(orders_df["assigned_warehouse_id"])
+        order_sold = orders_df["order_status"].isin(["Delivered", "Shipped", "Processing"]).to_numpy()
+        order_returned = orders_df["return_flag"].fillna(False).to_numpy(dtype=bool)
+
+        item_wh = order_wh[order_pos]
+        item_prod = product_index.get_indexer(order_items_df["product_id"])[known]
+        item_qty = order_items_df["quantity"].to_numpy(dtype=np.int64)[known]
+        sold = order_sold[order_pos]
+        returned = order_returned[order_pos]
+        units_sold = _aggregate_units(item_wh[sold], item_prod[sold], item_qty[sold], shape[1])
+        units_returned = _aggregate_units(item_wh[returned], item_prod[returned], item_qty[returned], shape[1])
 
     # Calculate units received from shipments arriving today
-    units_received_map = {}
+    units_received = np.zeros(shape, dtype=np.int64)
     if len(shipments_arriving) > 0:
-        received_agg = shipments_arriving.groupby(["warehouse_id", "product_id"])["quantity"].sum().to_dict()
-        units_received_map = {(wh, pid): qty for (wh, pid), qty in received_agg.items()}
-
-    # Calculate returns
-    units_returned_map = {}
-    if len(orders_df) > 0 and len(order_items_df) > 0:
-        returned_orders = orders_df[orders_df["return_flag"]]["order_id"]
-        if len(returned_orders) > 0:
-            returned_items = order_items_df[order_items_df["order_id"].isin(returned_orders)]
-            if len(returned_items) > 0:
-                returned_merged = returned_items.merge(
-                    orders_df[["order_id", "assigned_warehouse_id"]], on="order_id", how="left"
-                )
-                ret_agg = returned_merged.groupby(["assigned_warehouse_id", "product_id"])["quantity"].sum().to_dict()
-                units_returned_map = {(wh, pid): qty for (wh, pid), qty in ret_agg.items()}
-
-    rows = []
-
-    for wh_id in WAREHOUSE_IDS:
-        # ── Warehouse-specific holding cost multiplier ───────────
-        # NYC/LA have 35-45% higher warehouse costs per sq ft than
-        # Denver/Dallas due to real estate prices. This creates natural
-        # holding_cost variance across warehouses in mart_daily_product_kpis
-        # and mart_daily_warehouse_kpis without post-processing.
-        wh_cost_multiplier = WAREHOUSE_HOLDING_COST_MULTIPLIERS.get(wh_id, 1.0)
-
-        for _, product in products_df.iterrows():
-            pid = product["product_id"]
-            key = (wh_id, pid)
-
-            prev = inventory_state.get(key, {"closing_stock": 100, "units_on_order": 0, "avg_daily_demand": 0})
-            opening_stock = prev["closing_stock"]
-            units_sold = units_sold_map.get(key, 0)
-            units_received = units_received_map.get(key, 0)
-            units_returned = units_returned_map.get(key, 0)
-
-            closing_stock = max(0, opening_stock - units_sold + units_received + units_returned)
-
-            stockout_flag = closing_stock == 0
-            below_safety = closing_stock < product["safety_stock"]
-            reorder_triggered = closing_stock <= product["reorder_point"] and prev["units_on_order"] == 0
-
-            units_on_order = prev["units_on_order"]
-            if units_received > 0:
-                units_on_order = max(0, units_on_order - units_received)
-            if reorder_triggered:
-                reorder_qty = int(rng.integers(*REORDER_QUANTITY_RANGE))
-                units_on_order += reorder_qty
-
-            alpha = 0.1
-            avg_demand = prev["avg_daily_demand"] * (1 - alpha) + units_sold * alpha
-
-            days_of_supply = round(closing_stock / avg_demand, 2) if avg_demand > 0 else 99.99
-            days_of_supply = min(99.99, days_of_supply)
-
-            cost_price = product["cost_price"]
-            # Apply warehouse-specific holding cost multiplier
-            holding_cost = round(closing_stock * cost_price * HOLDING_COST_RATE * wh_cost_multiplier, 2)
-            inventory_value = round(closing_stock * cost_price, 2)
-
-            rows.append(
-                {
-                    "snapshot_date": current_date,
-                    "warehouse_id": wh_id,
-                    "product_id": pid,
-                    "opening_stock": opening_stock,
-                    "units_sold": units_sold,
-                    "units_received": units_received,
-                    "units_returned": units_returned,
-                    "closing_stock": closing_stock,
-                    "stockout_flag": stockout_flag,
-                    "below_safety_stock_flag": below_safety,
-                    "reorder_triggered_flag": reorder_triggered,
-                    "units_on_order": units_on_order,
-                    "days_of_supply": days_of_supply,
-                    "holding_cost": holding_cost,
-                    "inventory_value": inventory_value,
-                    "created_at": now,
-                    "updated_at": now,
-                    "batch_id": batch_id,
-                }
-            )
-
-            inventory_state[key] = {
-                "closing_stock": closing_stock,
-                "units_on_order": units_on_order,
-                "avg_daily_demand": avg_demand,
-            }
-
-    return pd.DataFrame(rows), inventory_state
+        units_received = _aggregate_units(
+            _WAREHOUSE_INDEX.get_indexer(shipments_arriving["warehouse_id"]),
+            product_index.get_indexer(shipments_arriving["product_id"]),
+            shipments_arriving["quantity"].to_numpy(dtype=np.int64),
+            shape[1],
+        )
+
+    opening_stock = inventory_state["closing_stock"].astype(np.int64)
+    prev_on_order = inventory_state["units_on_order"].astype(np.int64)
+
+    closing_stock = np.maximum(0, opening_stock - units_sold + units_received + units_returned)
+
+    stockout_flag = closing_stock == 0
+    below_safety = closing_stock < safety_stock
+    reorder_triggered = (closing_stock <= reorder_point) & (prev_on_order == 0)
+
+    units_on_order = np.where(units_received > 0, np.maximum(0, prev_on_order - units_received), prev_on_order)
+    # Reorder quantities are drawn warehouse-major, product-minor (row-major order)
+    units_on_order[reorder_triggered] += rng.integers(*REORDER_QUANTITY_RANGE, size=int(reorder_triggered.sum()))
+
+    alpha = 0.1
+    avg_demand = inventory_state["avg_daily_demand"] * (1 - alpha) + units_sold * alpha
+
+    days_of_supply = np.minimum(99.99, calculate_days_of_supply(closing_stock, avg_demand))
+
+    # Apply warehouse-specific holding cost multiplier
+    holding_cost = calculate_holding_cost(closing_stock, cost_price, _WH_COST_MULTIPLIER[:, None])
+    inventory_value = calculate_inventory_value(closing_stock, cost_price)
+
+    # Every numeric column is a fresh array from above, so the frame takes
+    # them without copying; only the cached key columns are copied
+    warehouse_col, product_col = _snapshot_keys(products_df)
+    snapshot_df = pd.DataFrame(
+        {
+            "snapshot_date": current_date,
+            "warehouse_id": warehouse_col.copy(),
+            "product_id": product_col.copy(),
+            "opening_stock": opening_stock.ravel(),
+            "units_sold": units_sold.ravel(),
+            "units_received": units_received.ravel(),
+            "units_returned": units_returned.ravel(),
+            "closing_stock": closing_stock.ravel(),
+            "stockout_flag": stockout_flag.ravel(),
+            "below_safety_stock_flag": below_safety.ravel(),
+            "reorder_triggered_flag": reorder_triggered.ravel(),
+            "units_on_order": units_on_order.ravel(),
+            "days_of_supply": days_of_supply.ravel(),
+            "holding_cost": holding_cost.ravel(),
+            "inventory_value": inventory_value.ravel(),
+            "created_at": now,
+            "updated_at": now,
+            "batch_id": batch_id,
+        },
+        copy=False,
+    )
+
+    inventory_state["closing_stock"] = closing_stock
+    inventory_state["units_on_order"] = units_on_order
+    inventory_state["avg_daily_demand"] = avg_demand
+
+    return snapshot_df, inventory_state
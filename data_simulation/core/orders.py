@@ -9,31 +9,127 @@ v4: Added warehouse-specific cost_optimal redirect probability.
     the allocation efficiency and cross-region % metrics.
 """
 
-from datetime import date, datetime
+from datetime import date
 from typing import Tuple
 
 import numpy as np
 import pandas as pd
 
 from config.constants import (
-    ALLOCATION_STRATEGIES,
-    BATCH_ID_PREFIX,
+    ALLOCATION_STRATEGY_CDF,
+    ALLOCATION_STRATEGY_KEYS,
     CATEGORY_DEMAND_WEIGHTS,
     COST_OPTIMAL_REDIRECT_PROBABILITY,
     DAILY_ORDERS,
     DISCOUNT_PROBABILITY,
     DISCOUNT_RANGE,
-    ORDER_PRIORITY_DISTRIBUTION,
-    ORDER_STATUS_DISTRIBUTION,
+    ORDER_PRIORITY_CDF,
+    ORDER_PRIORITY_KEYS,
+    ORDER_STATUS_CDF,
+    ORDER_STATUS_KEYS,
     RETURN_RATE,
-    WAREHOUSE_DEMAND_WEIGHTS,
+    WAREHOUSE_DEMAND_CDF,
+    WAREHOUSE_DEMAND_KEYS,
     WAREHOUSE_REGION_MAP,
     get_price_inflation_multiplier,
+    sample_category,
 )
+from config.warehouse_config import WAREHOUSE_ID_ARR, WAREHOUSE_IDS
 from data_simulation.utils.cost import calculate_delivery_cost, calculate_fulfillment_cost
-from data_simulation.utils.geo import find_nearest_warehouse, get_delivery_distance
+from data_simulation.utils.frame_cache import reuse_for_same_frame
+from data_simulation.utils.geo import get_delivery_distances, nearest_warehouse_codes
+from data_simulation.utils.ids import day_stamp, sequence_ids
 from data_simulation.utils.seasonality import get_daily_order_count
 
+# Items per order and units per item, drawn uniformly (repeats set the weights)
+ITEMS_PER_ORDER_CHOICES = np.array([1, 1, 1, 2, 2, 2, 3, 3, 4, 5])
+ITEM_QUANTITY_CHOICES = np.array([1, 1, 1, 2, 2, 3])
+_EXPERIMENT_GROUPS = np.array(["Control", "Treatment"], dtype=object)
+
+# Order hour of day (6:00-22:59) and its demand profile as a CDF for sample_category
+_ORDER_HOURS = np.arange(6, 23)
+_HOUR_CDF = np.cumsum(
+    [0.02, 0.03, 0.05, 0.08, 0.10, 0.12, 0.11, 0.09, 0.08, 0.07, 0.06, 0.05, 0.04, 0.04, 0.03, 0.02, 0.01]
+)
+_HOUR_CDF /= _HOUR_CDF[-1]
+
+_WAREHOUSE_INDEX = pd.Index(WAREHOUSE_IDS)
+# Position in WAREHOUSE_IDS of each WAREHOUSE_DEMAND_KEYS entry
+_DEMAND_WAREHOUSE_CODE = _WAREHOUSE_INDEX.get_indexer(WAREHOUSE_DEMAND_KEYS)
+_REDIRECT_PROBABILITY = np.array([COST_OPTIMAL_REDIRECT_PROBABILITY.get(wh_id, 0.30) for wh_id in WAREHOUSE_IDS])
+_NEAREST = int(np.flatnonzero(ALLOCATION_STRATEGY_KEYS == "nearest")[0])
+_COST_OPTIMAL = int(np.flatnonzero(ALLOCATION_STRATEGY_KEYS == "cost_optimal")[0])
+_DELIVERED = int(np.flatnonzero(ORDER_STATUS_KEYS == "Delivered")[0])
+
+
+@reuse_for_same_frame
+def _customer_nearest_warehouse(customers_df: pd.DataFrame) -> np.ndarray:
+    """
+    Position in WAREHOUSE_IDS of each customer's nearest warehouse. Customers
+    do not move, so this is computed once per dim_customer frame.
+    """
+    return nearest_warehouse_codes(customers_df["latitude"].to_numpy(), customers_df["longitude"].to_numpy())
+
+
+@reuse_for_same_frame
+def _customer_pools(customers_df: pd.DataFrame) -> tuple:
+    """
+    Customers in each warehouse's region, laid out back to back in one array
+    (all customers for a warehouse whose region has none).
+    Returns: (customer_pool, pool_start, pool_size), where the pool for
+    WAREHOUSE_IDS[k] is pool_start[k] : pool_start[k] + pool_size[k].
+    """
+    regions = customers_df["region"].to_numpy(dtype=object)
+    all_customers = np.arange(len(customers_df))
+    pools = []
+    for wh_id in WAREHOUSE_IDS:
+        in_region = np.flatnonzero(regions == WAREHOUSE_REGION_MAP.get(wh_id, ""))
+        pools.append(in_region if len(in_region) > 0 else all_customers)
+    pool_size = np.array([len(pool) for pool in pools])
+    pool_start = np.concatenate([[0], np.cumsum(pool_size)[:-1]])
+    return np.concatenate(pools), pool_start, pool_size
+
+
+@reuse_for_same_frame
+def _product_demand_cdf(products_df: pd.DataFrame) -> np.ndarray:
+    """CDF of category-weighted product demand, in dim_product row order."""
+    weights = np.array([CATEGORY_DEMAND_WEIGHTS.get(cat, 1.0) for cat in products_df["category"].to_numpy()])
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+
+@reuse_for_same_frame
+def _experiment_targets(experiments_df: pd.DataFrame) -> np.ndarray:
+    """
+    targets[e, k]: WAREHOUSE_IDS[k] is a target of the experiment in row e of
+    experiments_df (no targets when target_warehouses is missing).
+    """
+    targets = np.zeros((len(experiments_df), len(WAREHOUSE_IDS)), dtype=bool)
+    for row, whs in enumerate(experiments_df["target_warehouses"]):
+        if isinstance(whs, str):
+            targets[row] = np.isin(WAREHOUSE_IDS, whs.split(","))
+    return targets
+
+
+def _sample_products(rng: np.random.Generator, cdf: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Pick counts[i] distinct products for every order i from a demand CDF, as
+    rng.choice(..., replace=False, p=...) would per order, and return an
+    (orders, max(counts)) array padded with -1.
+    Slot j is drawn for every order that needs it at once; orders whose draw
+    repeats one of their earlier picks redraw it. Redrawing a repeat is the same
+    as drawing from the remaining products renormalized, so this is exact
+    weighted sampling without replacement.
+    """
+    picks = np.full((len(counts), int(counts.max(initial=0))), -1, dtype=np.intp)
+    for slot in range(picks.shape[1]):
+        rows = np.flatnonzero(counts > slot)
+        while len(rows) > 0:
+            draw = sample_category(rng, cdf, len(rows))
+            picks[rows, slot] = draw
+            rows = rows[(picks[rows, :slot] == draw[:, None]).any(axis=1)]
+    return picks
+
 
 def generate_daily_orders(
     current_date: date,
@@ -52,197 +148,136 @@ def generate_daily_orders(
       Denver: 15% redirect (low volume, nearest usually optimal)
     - This creates realistic cross-region % variation across warehouses
     - nearest_assignment_rate naturally differs: NYC ~58%, Denver ~95%
+
+    Every order attribute is drawn for the whole day as one array, and items
+    are generated as flat arrays across all orders.
     """
-    batch_id = f"{BATCH_ID_PREFIX}_{current_date.strftime('%Y%m%d')}"
-    now = datetime.combine(current_date, datetime.min.time())
+    date_str, batch_id, day_start = day_stamp(current_date)
     year = current_date.year
 
     price_inflation = get_price_inflation_multiplier(year)
     num_orders = get_daily_order_count(DAILY_ORDERS, current_date, rng)
 
-    priorities = list(ORDER_PRIORITY_DISTRIBUTION.keys())
-    priority_probs = list(ORDER_PRIORITY_DISTRIBUTION.values())
-    statuses = list(ORDER_STATUS_DISTRIBUTION.keys())
-    status_probs = list(ORDER_STATUS_DISTRIBUTION.values())
-    strategies = list(ALLOCATION_STRATEGIES.keys())
-    strategy_probs = list(ALLOCATION_STRATEGIES.values())
-
-    active_experiments = experiments_df[
+    active = (
         (experiments_df["start_date"] <= current_date)
         & ((experiments_df["end_date"].isna()) | (experiments_df["end_date"] >= current_date))
-    ]
-
-    # Product arrays
-    product_ids = products_df["product_id"].values
-    product_prices = products_df["selling_price"].values * price_inflation
-    product_cats = products_df["category"].values
-
-    # ── Build region-to-customer index for fast lookup ──────────
-    region_customer_idx = {}
-    for region in customers_df["region"].unique():
-        mask = customers_df["region"] == region
-        region_customer_idx[region] = np.where(mask)[0]
-
-    # Warehouse demand weights normalized to probabilities
-    wh_ids = list(WAREHOUSE_DEMAND_WEIGHTS.keys())
-    wh_weights = np.array([WAREHOUSE_DEMAND_WEIGHTS[w] for w in wh_ids])
-    wh_weights = wh_weights / wh_weights.sum()
-
-    # Fallback: all customers
-    all_cust_idx = np.arange(len(customers_df))
-
-    orders_rows = []
-    items_rows = []
-    item_counter = 1
-
-    for i in range(num_orders):
-        order_id = f"ORD-{current_date.strftime('%Y%m%d')}-{i + 1:05d}"
-
-        hour = int(rng.choice(range(6, 23), p=_hour_weights()))
-        minute = int(rng.integers(0, 60))
-        order_timestamp = now.replace(hour=hour, minute=minute)
-
-        # ── Region-biased customer selection ────────────────────
-        target_wh = rng.choice(wh_ids, p=wh_weights)
-        target_region = WAREHOUSE_REGION_MAP.get(target_wh, "")
-        region_idx = region_customer_idx.get(target_region, all_cust_idx)
-
-        if len(region_idx) > 0:
-            cust_idx = int(rng.choice(region_idx))
-        else:
-            cust_idx = int(rng.integers(0, len(customers_df)))
-
-        customer_id = customers_df["customer_id"].iloc[cust_idx]
-        cust_lat = customers_df["latitude"].iloc[cust_idx]
-        cust_lon = customers_df["longitude"].iloc[cust_idx]
-
-        nearest_wh = find_nearest_warehouse(cust_lat, cust_lon)
-
-        # ── Allocation strategy with warehouse-specific redirect ─
-        strategy = rng.choice(strategies, p=strategy_probs)
-        if strategy == "nearest":
-            assigned_wh = nearest_wh
-        elif strategy == "cost_optimal":
-            # ── FIX: warehouse-specific redirect probability ─────
-            # High-demand warehouses (NYC/LA) are frequently at or near
-            # capacity, so cost_optimal routing redirects more orders
-            # to balance load. Low-demand warehouses (Denver) rarely
-            # need to redirect since they have spare capacity.
-            # This creates natural variation in nearest_assignment_rate
-            # and cross_region_pct across warehouses without post-processing.
-            redirect_prob = COST_OPTIMAL_REDIRECT_PROBABILITY.get(nearest_wh, 0.30)
-            if rng.random() < redirect_prob:
-                assigned_wh = rng.choice(wh_ids, p=wh_weights)
-            else:
-                assigned_wh = nearest_wh
-        else:  # load_balanced
-            assigned_wh = rng.choice(wh_ids, p=wh_weights)
-
-        priority = rng.choice(priorities, p=priority_probs)
-        status = rng.choice(statuses, p=status_probs)
-
-        return_flag = False
-        if status == "Delivered" and rng.random() < RETURN_RATE:
-            return_flag = True
-
-        experiment_id = None
-        experiment_group = None
-        if len(active_experiments) > 0 and rng.random() < 0.40:
-            exp = active_experiments.sample(1, random_state=int(rng.integers(0, 100000))).iloc[0]
-            target_whs = exp["target_warehouses"].split(",") if pd.notna(exp["target_warehouses"]) else []
-            if assigned_wh in target_whs:
-                experiment_id = exp["experiment_id"]
-                experiment_group = rng.choice(["Control", "Treatment"])
-
-        # Category-weighted product selection
-        num_items = int(rng.choice([1, 1, 1, 2, 2, 2, 3, 3, 4, 5]))
-        cat_weights = np.array([CATEGORY_DEMAND_WEIGHTS.get(cat, 1.0) for cat in product_cats])
-        cat_weights = cat_weights / cat_weights.sum()
-        selected_products = rng.choice(len(product_ids), size=num_items, replace=False, p=cat_weights)
-
-        total_amount = 0.0
-        total_items = 0
-
-        for prod_idx in selected_products:
-            item_id = f"ITM-{current_date.strftime('%Y%m%d')}-{item_counter:06d}"
-            quantity = int(rng.choice([1, 1, 1, 2, 2, 3]))
-            unit_price = round(float(product_prices[prod_idx]), 2)
-
-            discount = 0.0
-            if rng.random() < DISCOUNT_PROBABILITY:
-                discount_pct = rng.uniform(*DISCOUNT_RANGE)
-                discount = round(unit_price * quantity * discount_pct, 2)
-
-            revenue = round(unit_price * quantity - discount, 2)
-
-            items_rows.append(
-                {
-                    "order_item_id": item_id,
-                    "order_id": order_id,
-                    "product_id": product_ids[prod_idx],
-                    "quantity": quantity,
-                    "unit_price": unit_price,
-                    "discount_amount": discount,
-                    "revenue": revenue,
-                    "created_at": order_timestamp,
-                    "updated_at": order_timestamp,
-                    "batch_id": batch_id,
-                }
-            )
-
-            total_amount += revenue
-            total_items += quantity
-            item_counter += 1
-
-        distance = get_delivery_distance(assigned_wh, cust_lat, cust_lon)
-        delivery_cost = calculate_delivery_cost(distance)
-        fulfillment_cost = calculate_fulfillment_cost(delivery_cost, total_amount * 0.02)
-
-        orders_rows.append(
-            {
-                "order_id": order_id,
-                "order_date": current_date,
-                "order_timestamp": order_timestamp,
-                "customer_id": customer_id,
-                "assigned_warehouse_id": assigned_wh,
-                "nearest_warehouse_id": nearest_wh,
-                "allocation_strategy": strategy,
-                "order_priority": priority,
-                "total_items": total_items,
-                "total_amount": round(total_amount, 2),
-                "total_fulfillment_cost": round(fulfillment_cost, 2),
-                "order_status": status,
-                "return_flag": return_flag,
-                "experiment_id": experiment_id,
-                "experiment_group": experiment_group,
-                "created_at": order_timestamp,
-                "updated_at": order_timestamp,
-                "batch_id": batch_id,
-            }
-        )
-
-    return pd.DataFrame(orders_rows), pd.DataFrame(items_rows)
-
-
-def _hour_weights():
-    weights = [
-        0.02,
-        0.03,
-        0.05,
-        0.08,
-        0.10,
-        0.12,
-        0.11,
-        0.09,
-        0.08,
-        0.07,
-        0.06,
-        0.05,
-        0.04,
-        0.04,
-        0.03,
-        0.02,
-        0.01,
-    ]
-    total = sum(weights)
-    return [w / total for w in weights]
+    ).to_numpy()
+    active_experiments = experiments_df[active]
+
+    product_ids = products_df["product_id"].to_numpy()
+    product_prices = products_df["selling_price"].to_numpy() * price_inflation
+
+    customer_ids = customers_df["customer_id"].to_numpy()
+    customer_lat = customers_df["latitude"].to_numpy()
+    customer_lon = customers_df["longitude"].to_numpy()
+
+    # Order time of day
+    hour = _ORDER_HOURS[sample_category(rng, _HOUR_CDF, num_orders)]
+    order_minute = hour * 60 + rng.integers(0, 60, size=num_orders)
+
+    # ── Region-biased customer selection ────────────────────
+    # A demand-weighted target warehouse, then a uniform customer from its region
+    customer_pool, pool_start, pool_size = _customer_pools(customers_df)
+    target_wh = _DEMAND_WAREHOUSE_CODE[sample_category(rng, WAREHOUSE_DEMAND_CDF, num_orders)]
+    order_cust_idx = customer_pool[pool_start[target_wh] + rng.integers(0, pool_size[target_wh])]
+    nearest_wh = _customer_nearest_warehouse(customers_df)[order_cust_idx]
+
+    # ── Allocation strategy with warehouse-specific redirect ─
+    # High-demand warehouses (NYC/LA) are frequently at or near capacity, so
+    # cost_optimal routing redirects more orders to balance load. Low-demand
+    # warehouses (Denver) rarely need to redirect since they have spare capacity.
+    # This creates natural variation in nearest_assignment_rate and
+    # cross_region_pct across warehouses without post-processing.
+    # load_balanced orders and redirected cost_optimal orders go to a
+    # demand-weighted warehouse.
+    strategy = sample_category(rng, ALLOCATION_STRATEGY_CDF, num_orders)
+    redirected = rng.random(num_orders) < _REDIRECT_PROBABILITY[nearest_wh]
+    demand_wh = _DEMAND_WAREHOUSE_CODE[sample_category(rng, WAREHOUSE_DEMAND_CDF, num_orders)]
+    keep_nearest = (strategy == _NEAREST) | ((strategy == _COST_OPTIMAL) & ~redirected)
+    assigned_wh = np.where(keep_nearest, nearest_wh, demand_wh)
+
+    priority = sample_category(rng, ORDER_PRIORITY_CDF, num_orders)
+    status = sample_category(rng, ORDER_STATUS_CDF, num_orders)
+    return_flag = (status == _DELIVERED) & (rng.random(num_orders) < RETURN_RATE)
+
+    # ── Experiments ─────────────────────────────────────────
+    # 40% of orders draw one active experiment uniformly and join it when
+    # their assigned warehouse is one of its targets
+    experiment_id = np.full(num_orders, None, dtype=object)
+    experiment_group = np.full(num_orders, None, dtype=object)
+    if len(active_experiments) > 0:
+        exp_ids = active_experiments["experiment_id"].to_numpy(dtype=object)
+        # targets[e, k]: WAREHOUSE_IDS[k] is a target of active experiment e
+        targets = _experiment_targets(experiments_df)[active]
+        exp_pick = rng.integers(0, len(exp_ids), size=num_orders)
+        enrolled = (rng.random(num_orders) < 0.40) & targets[exp_pick, assigned_wh]
+        experiment_id[enrolled] = exp_ids[exp_pick[enrolled]]
+        experiment_group[enrolled] = _EXPERIMENT_GROUPS[rng.integers(0, 2, size=int(enrolled.sum()))]
+
+    # ── Items: category-weighted products, distinct within an order ─
+    items_per_order = ITEMS_PER_ORDER_CHOICES[rng.integers(0, len(ITEMS_PER_ORDER_CHOICES), size=num_orders)]
+    picks = _sample_products(rng, _product_demand_cdf(products_df), items_per_order)
+    # Row-major selection keeps each order's items together, in pick order
+    item_product_idx = picks[picks >= 0]
+    item_pos = np.repeat(np.arange(num_orders), items_per_order)
+    n_items = len(item_product_idx)
+
+    quantity = ITEM_QUANTITY_CHOICES[rng.integers(0, len(ITEM_QUANTITY_CHOICES), size=n_items)]
+    unit_price = np.round(product_prices[item_product_idx], 2)
+    discounted = rng.random(n_items) < DISCOUNT_PROBABILITY
+    discount_pct = rng.uniform(*DISCOUNT_RANGE, size=n_items)
+    discount = np.where(discounted, np.round(unit_price * quantity * discount_pct, 2), 0.0)
+    revenue = np.round(unit_price * quantity - discount, 2)
+
+    # Per-order totals; the unrounded revenue sum feeds the cost formula
+    total_items = np.bincount(item_pos, weights=quantity, minlength=num_orders).astype(np.int64)
+    revenue_sum = np.bincount(item_pos, weights=revenue, minlength=num_orders)
+
+    # Delivery distance and fulfillment cost for all orders in one array pass
+    distance = get_delivery_distances(assigned_wh, customer_lat[order_cust_idx], customer_lon[order_cust_idx])
+    fulfillment_cost = calculate_fulfillment_cost(calculate_delivery_cost(distance), revenue_sum * 0.02)
+
+    order_ids = sequence_ids(f"ORD-{date_str}-", 1, num_orders, 5)
+    order_ts = pd.Series(day_start + order_minute.astype("timedelta64[m]"))
+    orders_df = pd.DataFrame(
+        {
+            "order_id": order_ids,
+            "order_date": current_date,
+            "order_timestamp": order_ts,
+            "customer_id": customer_ids[order_cust_idx],
+            "assigned_warehouse_id": WAREHOUSE_ID_ARR[assigned_wh],
+            "nearest_warehouse_id": WAREHOUSE_ID_ARR[nearest_wh],
+            "allocation_strategy": ALLOCATION_STRATEGY_KEYS[strategy],
+            "order_priority": ORDER_PRIORITY_KEYS[priority],
+            "total_items": total_items,
+            "total_amount": np.round(revenue_sum, 2),
+            "total_fulfillment_cost": fulfillment_cost,
+            "order_status": ORDER_STATUS_KEYS[status],
+            "return_flag": return_flag,
+            "experiment_id": experiment_id,
+            "experiment_group": experiment_group,
+            "created_at": order_ts,
+            "updated_at": order_ts,
+            "batch_id": batch_id,
+        },
+        index=pd.RangeIndex(num_orders),
+    )
+
+    item_ts = order_ts.iloc[item_pos].reset_index(drop=True)
+    items_df = pd.DataFrame(
+        {
+            "order_item_id": sequence_ids(f"ITM-{date_str}-", 1, n_items, 6),
+            "order_id": order_ids[item_pos],
+            "product_id": product_ids[item_product_idx],
+            "quantity": quantity,
+            "unit_price": unit_price,
+            "discount_amount": discount,
+            "revenue": revenue,
+            "created_at": item_ts,
+            "updated_at": item_ts,
+            "batch_id": batch_id,
+        },
+        index=pd.RangeIndex(n_items),
+    )
+
+    return orders_df, items_df
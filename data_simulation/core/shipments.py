@@ -5,24 +5,54 @@ Shipment generation for a single day.
 Generates: fact_shipments (supplier → warehouse replenishment)
 """
 
-from datetime import date, datetime, timedelta
-from typing import Dict, List, Tuple
+from datetime import date, datetime
+from itertools import repeat
+from typing import List, Tuple
 
 import numpy as np
 import pandas as pd
 
 from config.constants import (
-    BATCH_ID_PREFIX,
     REORDER_QUANTITY_RANGE,
 )
+from config.warehouse_config import WAREHOUSE_ID_ARR
 from data_simulation.utils.cost import calculate_shipment_cost
+from data_simulation.utils.frame_cache import reuse_for_same_frame
+from data_simulation.utils.ids import day_stamp, sequence_ids
+
+
+@reuse_for_same_frame
+def _supplier_pools(suppliers_df: pd.DataFrame) -> tuple:
+    """
+    Suppliers serving each category, laid out back to back (dim_supplier row
+    order within a category) with their attributes at the same positions.
+    Returns: (category Index, pool_start, pool_size, supplier_ids, average_lead_times,
+    lead_time_std_devs, reliability_scores), where the pool for category c is
+    pool_start[c] : pool_start[c] + pool_size[c].
+    """
+    pools = {}
+    for row, categories in enumerate(suppliers_df["product_categories"]):
+        for cat in categories.split(","):
+            pools.setdefault(cat.strip(), []).append(row)
+    rows = np.concatenate([np.asarray(pool) for pool in pools.values()]) if pools else np.array([], dtype=np.intp)
+    pool_size = np.array([len(pool) for pool in pools.values()], dtype=np.intp)
+    pool_start = np.concatenate([[0], np.cumsum(pool_size)[:-1]]).astype(np.intp)
+    return (
+        pd.Index(list(pools)),
+        pool_start,
+        pool_size,
+        suppliers_df["supplier_id"].to_numpy(dtype=object)[rows],
+        suppliers_df["average_lead_time"].to_numpy(dtype=np.int64)[rows],
+        suppliers_df["lead_time_std_dev"].to_numpy(dtype=np.float64)[rows],
+        suppliers_df["reliability_score"].to_numpy(dtype=np.float64)[rows],
+    )
 
 
 def generate_daily_shipments(
     current_date: date,
     products_df: pd.DataFrame,
     suppliers_df: pd.DataFrame,
-    inventory_state: Dict[Tuple[str, str], dict],
+    inventory_state: np.ndarray,
     pending_shipments: List[dict],
     rng: np.random.Generator,
     shipment_counter: int,
@@ -30,80 +60,60 @@ def generate_daily_shipments(
     """
     Generate fact_shipments for a single day.
     Creates new shipments for reorder triggers and resolves arriving shipments.
+    All of the day's triggers are handled together, with each random draw made
+    once as an array sized to the number of shipments.
 
     Returns: (shipments_df, updated_pending_shipments, updated_counter)
     """
-    batch_id = f"{BATCH_ID_PREFIX}_{current_date.strftime('%Y%m%d')}"
+    date_str, batch_id, day_start = day_stamp(current_date)
     now = datetime.combine(current_date, datetime.min.time())
 
-    # Build supplier lookup by category
-    supplier_by_category = {}
-    for _, sup in suppliers_df.iterrows():
-        cats = sup["product_categories"].split(",")
-        for cat in cats:
-            cat = cat.strip()
-            if cat not in supplier_by_category:
-                supplier_by_category[cat] = []
-            supplier_by_category[cat].append(sup)
-
-    product_lookup = products_df.set_index("product_id").to_dict("index")
-
-    new_shipments = []
+    category_index, pool_start, pool_size, supplier_ids, lead_times, lead_std_devs, reliabilities = _supplier_pools(
+        suppliers_df
+    )
 
     # Create shipments for products that triggered reorder
-    for (wh_id, pid), state in inventory_state.items():
-        product = product_lookup.get(pid)
-        if not product:
-            continue
-
-        # Check if reorder was triggered (closing_stock <= reorder_point and no pending orders)
-        if state["closing_stock"] <= product["reorder_point"] and state["units_on_order"] > 0:
-            # Find a supplier for this product's category
-            category = product["category"]
-            available_suppliers = supplier_by_category.get(category, [])
-
-            if not available_suppliers:
-                continue
-
-            # Pick a supplier (weighted by reliability)
-            supplier = available_suppliers[int(rng.integers(0, len(available_suppliers)))]
-
-            # Shipment quantity
-            quantity = int(rng.integers(*REORDER_QUANTITY_RANGE))
-
-            # Calculate lead time with variability
-            base_lead = supplier["average_lead_time"]
-            std_dev = supplier["lead_time_std_dev"]
-            actual_lead = max(1, int(rng.normal(base_lead, std_dev)))
-
-            expected_arrival = current_date + timedelta(days=base_lead)
-            actual_arrival = current_date + timedelta(days=actual_lead)
-
-            delay_days = max(0, actual_lead - base_lead)
-            delay_flag = delay_days > 0
-
-            # Is this a reliability miss?
-            if rng.random() > supplier["reliability_score"]:
-                # Supplier is late — add extra delay
-                extra_delay = int(rng.integers(1, 5))
-                actual_lead += extra_delay
-                actual_arrival = current_date + timedelta(days=actual_lead)
-                delay_days = actual_lead - base_lead
-                delay_flag = True
-
-            shipment_id = f"SHP-{current_date.strftime('%Y%m%d')}-{shipment_counter:05d}"
-            shipment_cost = calculate_shipment_cost(quantity)
-
-            shipment = {
-                "shipment_id": shipment_id,
-                "supplier_id": supplier["supplier_id"],
-                "warehouse_id": wh_id,
-                "product_id": pid,
+    # (closing_stock <= reorder_point and units already on order),
+    # skipping products whose category no supplier serves
+    reorder_mask = (inventory_state["closing_stock"] <= products_df["reorder_point"].to_numpy()) & (
+        inventory_state["units_on_order"] > 0
+    )
+    wh_codes, prod_codes = np.nonzero(reorder_mask)
+    cat_codes = category_index.get_indexer(products_df["category"].to_numpy()[prod_codes])
+    served = cat_codes >= 0
+    wh_codes, prod_codes, cat_codes = wh_codes[served], prod_codes[served], cat_codes[served]
+    n = len(prod_codes)
+
+    shipments_df = pd.DataFrame()
+    if n > 0:
+        # Pick a supplier uniformly from the category's pool
+        supplier = pool_start[cat_codes] + rng.integers(0, pool_size[cat_codes])
+
+        # Shipment quantity
+        quantity = rng.integers(*REORDER_QUANTITY_RANGE, size=n)
+
+        # Lead time with variability (truncated toward zero, at least 1 day)
+        base_lead = lead_times[supplier]
+        actual_lead = np.maximum(1, np.trunc(rng.normal(base_lead, lead_std_devs[supplier])).astype(np.int64))
+
+        # Reliability misses: the supplier is late by an extra 1-4 days
+        missed = rng.random(n) > reliabilities[supplier]
+        actual_lead += np.where(missed, rng.integers(1, 5, size=n), 0)
+        delay_days = np.where(missed, actual_lead - base_lead, np.maximum(0, actual_lead - base_lead))
+        delay_flag = missed | (delay_days > 0)
+
+        day = day_start.astype("datetime64[D]")
+        shipments_df = pd.DataFrame(
+            {
+                "shipment_id": sequence_ids(f"SHP-{date_str}-", shipment_counter, n, 5),
+                "supplier_id": supplier_ids[supplier],
+                "warehouse_id": WAREHOUSE_ID_ARR[wh_codes],
+                "product_id": products_df["product_id"].to_numpy()[prod_codes],
                 "quantity": quantity,
-                "shipment_cost": shipment_cost,
+                "shipment_cost": calculate_shipment_cost(quantity),
                 "shipment_date": current_date,
-                "expected_arrival_date": expected_arrival,
-                "actual_arrival_date": actual_arrival,
+                "expected_arrival_date": (day + base_lead.astype("timedelta64[D]")).astype(object),
+                "actual_arrival_date": (day + actual_lead.astype("timedelta64[D]")).astype(object),
                 "delay_days": delay_days,
                 "delay_flag": delay_flag,
                 "reorder_triggered_flag": True,
@@ -111,23 +121,30 @@ def generate_daily_shipments(
                 "updated_at": now,
                 "batch_id": batch_id,
             }
-
-            new_shipments.append(shipment)
-            pending_shipments.append(shipment)
-            shipment_counter += 1
-
-    # Find shipments arriving today
-    arriving_today = [s for s in pending_shipments if s["actual_arrival_date"] == current_date]
-
-    # Remove arrived shipments from pending
-    pending_shipments = [s for s in pending_shipments if s["actual_arrival_date"] > current_date]
-
-    # Combine new shipments + any that need to be recorded
-    all_shipments_today = new_shipments
+        )
+        # Pending shipments are kept as records (the state is stored as JSON),
+        # with plain Python values in every field
+        columns = list(shipments_df.columns)
+        pending_shipments.extend(
+            dict(zip(columns, row))
+            for row in zip(
+                *(
+                    repeat(now) if name in ("created_at", "updated_at") else shipments_df[name].tolist()
+                    for name in columns
+                )
+            )
+        )
+        shipment_counter += n
+
+    # Split pending shipments in one pass: arriving today (or on an earlier day
+    # that was not simulated) versus still in transit
+    arriving_today = []
+    in_transit = []
+    for shipment in pending_shipments:
+        (arriving_today if shipment["actual_arrival_date"] <= current_date else in_transit).append(shipment)
+    pending_shipments = in_transit
 
     # Convert arriving shipments to DataFrame for inventory processing
     arriving_df = pd.DataFrame(arriving_today) if arriving_today else pd.DataFrame()
 
-    shipments_df = pd.DataFrame(all_shipments_today) if all_shipments_today else pd.DataFrame()
-
     return shipments_df, arriving_df, pending_shipments, shipment_counter
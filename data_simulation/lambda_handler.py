@@ -150,6 +150,7 @@ def maybe_inject_scd_changes(
 
     Changes are small (2-5 records per dimension) to be realistic for
     a weekly operational update — not the bulk changes of the extension backfill.
+    The DataFrames are modified in place when changes are made.
     """
     rng_scd = np.random.default_rng(run_seed + 999)
     roll = rng_scd.random()
@@ -164,7 +165,6 @@ def maybe_inject_scd_changes(
     n = len(products_df)
     price_idx = rng_scd.choice(n, size=rng_scd.integers(2, 4), replace=False)
     mult = rng_scd.uniform(1.02, 1.08, size=len(price_idx))
-    products_df = products_df.copy()
     products_df.loc[price_idx, "cost_price"] = (products_df.loc[price_idx, "cost_price"] * mult).round(2)
     products_df.loc[price_idx, "selling_price"] = (products_df.loc[price_idx, "selling_price"] * mult).round(2)
     print(f"    dim_product: {len(price_idx)} price adjustments")
@@ -172,7 +172,6 @@ def maybe_inject_scd_changes(
     # Supplier: 1-2 suppliers get reliability score update
     s_idx = rng_scd.choice(len(suppliers_df), size=rng_scd.integers(1, 3), replace=False)
     delta = rng_scd.uniform(-0.02, 0.02, size=len(s_idx))
-    suppliers_df = suppliers_df.copy()
     suppliers_df.loc[s_idx, "reliability_score"] = (
         (suppliers_df.loc[s_idx, "reliability_score"] + delta).clip(0.70, 1.0).round(2)
     )
@@ -181,7 +180,6 @@ def maybe_inject_scd_changes(
     # Driver: 1-3 drivers change availability status
     active_idx = drivers_df[drivers_df["availability_status"] == "Active"].index.tolist()
     leave_idx = drivers_df[drivers_df["availability_status"] == "On Leave"].index.tolist()
-    drivers_df = drivers_df.copy()
     if active_idx:
         go_leave = rng_scd.choice(active_idx, size=min(2, len(active_idx)), replace=False)
         drivers_df.loc[go_leave, "availability_status"] = "On Leave"
@@ -192,7 +190,6 @@ def maybe_inject_scd_changes(
 
     # Customer: 5-10 customers upgrade segment
     occ_idx = customers_df[customers_df["customer_segment"] == "Occasional"].index.tolist()
-    customers_df = customers_df.copy()
     if occ_idx:
         upgrade_idx = rng_scd.choice(occ_idx, size=min(5, len(occ_idx)), replace=False)
         customers_df.loc[upgrade_idx, "customer_segment"] = "Regular"
@@ -218,7 +215,6 @@ def generate_days(start_date: date, end_date: date, state_dict: dict = None) ->
         generate_dim_experiments,
         generate_dim_product,
         generate_dim_supplier,
-        generate_dim_warehouse,
     )
     from data_simulation.core.driver_activity import generate_daily_driver_activity
     from data_simulation.core.experiments import generate_daily_experiment_assignments
@@ -235,7 +231,6 @@ def generate_days(start_date: date, end_date: date, state_dict: dict = None) ->
 
     print("  Loading dimension tables...")
     products_df = generate_dim_product(rng_dims)
-    generate_dim_warehouse()
     suppliers_df = generate_dim_supplier()
     drivers_df = generate_dim_driver(rng_dims)
     customers_df = generate_dim_customer(rng_dims)
@@ -273,8 +268,13 @@ def generate_days(start_date: date, end_date: date, state_dict: dict = None) ->
         state.day_counter += 1
         print(f"  Generating {current_date} (day {day_num}/{total_days})...")
 
+        # Each day draws from its own SeedSequence keyed on the date, so a day's
+        # data does not depend on how many days the invocation covers
+        # (daily vs weekly vs manual runs) or where the range starts
+        day_rng = np.random.default_rng(np.random.SeedSequence([RANDOM_SEED, int(current_date.strftime("%Y%m%d"))]))
+
         orders_df, items_df = generate_daily_orders(
-            current_date, customers_df, products_df, experiments_df, rng, state.day_counter
+            current_date, customers_df, products_df, experiments_df, day_rng, state.day_counter
         )
         shipments_df, arriving_df, state.pending_shipments, state.shipment_counter = generate_daily_shipments(
             current_date,
@@ -282,18 +282,18 @@ def generate_days(start_date: date, end_date: date, state_dict: dict = None) ->
             suppliers_df,
             state.inventory_state,
             state.pending_shipments,
-            rng,
+            day_rng,
             state.shipment_counter,
         )
         inventory_df, state.inventory_state = generate_daily_inventory_snapshot(
-            current_date, products_df, orders_df, items_df, arriving_df, state.inventory_state, rng
+            current_date, products_df, orders_df, items_df, arriving_df, state.inventory_state, day_rng
         )
         deliveries_df, state.delivery_counter = generate_daily_deliveries(
-            current_date, orders_df, customers_df, drivers_df, rng, state.delivery_counter
+            current_date, orders_df, customers_df, drivers_df, day_rng, state.delivery_counter
         )
-        driver_activity_df = generate_daily_driver_activity(current_date, drivers_df, deliveries_df, rng)
+        driver_activity_df = generate_daily_driver_activity(current_date, drivers_df, deliveries_df, day_rng)
         assignments_df, state.assignment_counter = generate_daily_experiment_assignments(
-            current_date, orders_df, rng, state.assignment_counter
+            current_date, orders_df, day_rng, state.assignment_counter
         )
 
         upload_csv_to_s3(orders_df, "fact_orders", current_date)
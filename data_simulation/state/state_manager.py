@@ -2,20 +2,45 @@
 State manager for simulation.
 Tracks inventory levels, pending shipments, and counters between days.
 For backfill: state lives in memory.
-For Lambda: state is read/written to S3 as JSON.
+For Lambda: state is read/written to S3 as JSON (pending shipments column-wise).
 """
 
 # data_simulation/state/state_manager.py
 import json
-from typing import Dict, List, Tuple
+from datetime import date, datetime
+from typing import List
+
+import numpy as np
+
+from config.constants import NUM_PRODUCTS, NUM_WAREHOUSES
+from config.warehouse_config import WAREHOUSE_IDS
+
+# One record per (warehouse, product) cell. Rows follow WAREHOUSE_IDS order,
+# columns follow the row order of dim_product.
+INVENTORY_STATE_DTYPE = np.dtype(
+    [
+        ("closing_stock", np.int32),
+        ("units_on_order", np.int32),
+        ("avg_daily_demand", np.float64),
+    ]
+)
+
+# Date fields of a pending shipment and how to parse them back from strings
+_PENDING_DATE_PARSERS = {
+    "shipment_date": date.fromisoformat,
+    "expected_arrival_date": date.fromisoformat,
+    "actual_arrival_date": date.fromisoformat,
+    "created_at": datetime.fromisoformat,
+    "updated_at": datetime.fromisoformat,
+}
 
 
 class SimulationState:
     """Holds all state that carries over between simulation days."""
 
     def __init__(self):
-        # Inventory state: {(warehouse_id, product_id): {closing_stock, units_on_order, avg_daily_demand}}
-        self.inventory_state: Dict[Tuple[str, str], dict] = {}
+        # Inventory state: (warehouse, product) structured array of INVENTORY_STATE_DTYPE
+        self.inventory_state: np.ndarray = np.zeros((NUM_WAREHOUSES, NUM_PRODUCTS), dtype=INVENTORY_STATE_DTYPE)
 
         # Pending shipments waiting to arrive
         self.pending_shipments: List[dict] = []
@@ -30,17 +55,18 @@ class SimulationState:
 
     def to_dict(self) -> dict:
         """Serialize state to a dictionary (for JSON storage)."""
-        # Convert tuple keys to strings for JSON
-        inv_state = {}
-        for (wh_id, pid), val in self.inventory_state.items():
-            key = f"{wh_id}|{pid}"
-            inv_state[key] = val
-
-        # Convert dates in pending shipments to strings
-        pending = []
-        for s in self.pending_shipments:
-            s_copy = {k: str(v) if hasattr(v, "isoformat") else v for k, v in s.items()}
-            pending.append(s_copy)
+        # Store each field as a nested [warehouse][product] list for JSON
+        inv_state = {field: self.inventory_state[field].tolist() for field in INVENTORY_STATE_DTYPE.names}
+
+        # Pending shipments are stored column-wise ({field: [values]}), with
+        # dates as strings; every record carries the same fields
+        pending = {}
+        if self.pending_shipments:
+            for field in self.pending_shipments[0]:
+                values = [s[field] for s in self.pending_shipments]
+                if hasattr(values[0], "isoformat"):
+                    values = [str(v) for v in values]
+                pending[field] = values
 
         return {
             "inventory_state": inv_state,
@@ -54,17 +80,39 @@ class SimulationState:
     @classmethod
     def from_dict(cls, data: dict) -> "SimulationState":
         """Deserialize state from a dictionary."""
-        from datetime import date, datetime
-
         state = cls()
 
-        # Restore inventory state with tuple keys
-        for key, val in data.get("inventory_state", {}).items():
-            wh_id, pid = key.split("|")
-            state.inventory_state[(wh_id, pid)] = val
+        # Restore inventory state matrix
+        inv_state = data.get("inventory_state", {})
+        if any("|" in key for key in inv_state):
+            # Older states were keyed "warehouse_id|product_id"; product IDs are
+            # zero-padded in dim_product row order, so sorting recovers the columns.
+            pids = sorted({key.split("|")[1] for key in inv_state})
+            pid_pos = {pid: i for i, pid in enumerate(pids)}
+            state.inventory_state = np.zeros((len(WAREHOUSE_IDS), len(pids)), dtype=INVENTORY_STATE_DTYPE)
+            for key, val in inv_state.items():
+                wh_id, pid = key.split("|")
+                cell = state.inventory_state[WAREHOUSE_IDS.index(wh_id), pid_pos[pid]]
+                for field in INVENTORY_STATE_DTYPE.names:
+                    cell[field] = val[field]
+        elif inv_state:
+            closing = np.asarray(inv_state["closing_stock"])
+            state.inventory_state = np.zeros(closing.shape, dtype=INVENTORY_STATE_DTYPE)
+            for field in INVENTORY_STATE_DTYPE.names:
+                state.inventory_state[field] = inv_state[field]
 
         # Restore pending shipments with date objects
-        for s in data.get("pending_shipments", []):
+        pending = data.get("pending_shipments", [])
+        if isinstance(pending, dict):
+            for field, parse in _PENDING_DATE_PARSERS.items():
+                if field in pending:
+                    pending[field] = [parse(v) for v in pending[field]]
+            fields = list(pending)
+            state.pending_shipments = [dict(zip(fields, row)) for row in zip(*pending.values())]
+            pending = []
+
+        # Older states stored one dict per shipment
+        for s in pending:
             for date_field in ["shipment_date", "expected_arrival_date", "actual_arrival_date"]:
                 if date_field in s and s[date_field] and isinstance(s[date_field], str):
                     try:
@@ -1,10 +1,11 @@
 import argparse
 import os
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import zlib
 
 import boto3
-from boto3.s3.transfer import TransferConfig
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from botocore.config import Config
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,23 +16,44 @@ parser.add_argument(
     default="output",
     help="Output directory to upload (default: output). Use output_extension for extension backfill.",
 )
-parser.add_argument("--workers", type=int, default=16, help="Number of parallel upload threads (default: 16)")
+parser.add_argument("--workers", type=int, default=16, help="Number of concurrent S3 requests (default: 16)")
+parser.add_argument(
+    "--gzip",
+    action="store_true",
+    help="Gzip .csv files on the fly and upload them as .csv.gz (csv_format reads them with COMPRESSION = AUTO). "
+    "Parquet files are already ZSTD-compressed and are uploaded as-is. Use on a fresh prefix: a data.csv "
+    "left next to a data.csv.gz would be loaded twice.",
+)
 args = parser.parse_args()
 
-# TransferConfig: multipart upload for files > 8MB, 4 parallel parts per file
+# TransferConfig: multipart upload for files > 8MB. Every file goes through one
+# transfer manager, so max_concurrency bounds all requests in flight (whole small
+# files and parts of large ones alike) rather than the parts of a single file.
 transfer_config = TransferConfig(
     multipart_threshold=8 * 1024 * 1024,  # 8 MB
     multipart_chunksize=8 * 1024 * 1024,  # 8 MB chunks
-    max_concurrency=4,
+    max_concurrency=args.workers,
     use_threads=True,
 )
 
 bucket = os.getenv("S3_BUCKET_NAME")
+
+# One client for every transfer: boto3 clients are thread-safe, and building one
+# per file re-parsed credentials and botocore models on every upload. The
+# connection pool is sized for every request the manager keeps in flight.
+s3_client = boto3.client(
+    "s3",
+    aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+    region_name=os.getenv("AWS_REGION"),
+    config=Config(max_pool_connections=transfer_config.max_concurrency),
+)
 source_dir = os.path.join(args.dir, "raw")
 
 print(f"Uploading from : {source_dir}")
 print(f"Destination    : s3://{bucket}/raw/")
-print(f"Parallel workers: {args.workers}")
+print(f"Concurrent requests: {args.workers}")
+print(f"Gzip CSV files : {args.gzip}")
 print()
 
 # ── Collect all files first ───────────────────────────────────
@@ -40,41 +62,71 @@ for root, dirs, files in os.walk(source_dir):
     for file in files:
         local_path = os.path.join(root, file)
         s3_key = local_path.replace(args.dir + os.sep, "").replace("\\", "/")
+        if args.gzip and file.endswith(".csv"):
+            s3_key += ".gz"
         all_files.append((local_path, s3_key))
 
 total = len(all_files)
 print(f"Found {total:,} files to upload")
 print()
 
+
+class GzipStream:
+    """
+    Read-only stream of a file gzipped on the fly. The file is opened on the first
+    read (when the transfer manager gets to it) and closed at EOF, so only the
+    files being uploaded hold a handle and a compressed chunk in memory.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._src = None
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip container
+        self._buf = b""
+        self._done = False
+
+    def read(self, size: int = -1) -> bytes:
+        if self._src is None and not self._done:
+            self._src = open(self.path, "rb")
+        while not self._done and (size < 0 or len(self._buf) < size):
+            chunk = self._src.read(1024 * 1024)
+            if chunk:
+                self._buf += self._compressor.compress(chunk)
+            else:
+                self._buf += self._compressor.flush()
+                self._src.close()
+                self._done = True
+        if size < 0:
+            size = len(self._buf)
+        out, self._buf = self._buf[:size], self._buf[size:]
+        return out
+
+
+def upload_source(local_path: str, s3_key: str):
+    """The file path, or a lazily gzipped stream of the file when it is uploaded as .csv.gz."""
+    if not s3_key.endswith(".csv.gz"):
+        return local_path
+    return GzipStream(local_path)
+
+
 # ── Parallel upload ───────────────────────────────────────────
+# All files are submitted to a single transfer manager, which schedules small
+# files and multipart chunks on one shared, bounded pool.
 start_time = time.time()
 uploaded = 0
 failed = []
 
-
-def upload_file(args_tuple):
-    local_path, s3_key = args_tuple
-    try:
-        s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-            region_name=os.getenv("AWS_REGION"),
-        )
-        s3_client.upload_file(local_path, bucket, s3_key, Config=transfer_config)
-        return s3_key, None
-    except Exception as e:
-        return s3_key, str(e)
-
-
-with ThreadPoolExecutor(max_workers=args.workers) as executor:
-    futures = {executor.submit(upload_file, f): f for f in all_files}
-    for future in as_completed(futures):
-        s3_key, error = future.result()
-        if error:
-            failed.append((s3_key, error))
-        else:
-            uploaded += 1
+with create_transfer_manager(s3_client, transfer_config) as manager:
+    futures = [
+        (s3_key, manager.upload(upload_source(local_path, s3_key), bucket, s3_key)) for local_path, s3_key in all_files
+    ]
+    for s3_key, future in futures:
+        try:
+            future.result()
+        except Exception as e:
+            failed.append((s3_key, str(e)))
+            continue
+        uploaded += 1
 
         # Progress every 100 files
         if uploaded % 100 == 0 or uploaded == total:
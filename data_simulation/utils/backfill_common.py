@@ -0,0 +1,70 @@
+# data_simulation/utils/backfill_common.py
+"""
+Helpers shared by the local backfill scripts (backfill.py and backfill_extension.py):
+output partition directories, month Parquet files, process-pool worker setup and
+ID renumbering. numpy/pandas/pyarrow are imported inside the functions that use
+them so importing the backfill modules stays cheap.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Dimension tables shared by every day in a worker process (set once by init_worker)
+WORKER_DIMS = {}
+
+# Table directories already created this run ((output_dir, table_name) -> Path)
+_table_dirs = {}
+
+
+def partition_dir(output_dir: str, table_name: str, partition: str = None) -> Path:
+    """
+    Return output_dir/raw/<table_name> (and optional partition such as 'month=2025-02').
+    The table directory is created once per run; a new partition needs a single mkdir.
+    """
+    table_dir = _table_dirs.get((output_dir, table_name))
+    if table_dir is None:
+        table_dir = Path(output_dir, "raw", table_name)
+        table_dir.mkdir(parents=True, exist_ok=True)
+        _table_dirs[(output_dir, table_name)] = table_dir
+    if partition is None:
+        return table_dir
+    path = table_dir / partition
+    path.mkdir(exist_ok=True)
+    return path
+
+
+def save_parquet_month(output_dir: str, frames: list, table_name: str, month: str, file_name: str = "data.parquet"):
+    """
+    Save one month of daily fact frames as a single ZSTD-compressed Parquet file
+    (output_dir/raw/<table_name>/month=YYYY-MM/<file_name>). Each day becomes its own
+    row group so date-filtered scans can skip the rest.
+    """
+    from data_simulation.utils.parquet_writer import write_parquet
+
+    if any(len(df) > 0 for df in frames):
+        write_parquet(frames, partition_dir(output_dir, table_name, f"month={month}") / file_name, table_name)
+
+
+def init_worker(customers_df, products_df, drivers_df, experiments_df):
+    """Process-pool initializer: receive the dimension tables once per worker."""
+    WORKER_DIMS["customers"] = customers_df
+    WORKER_DIMS["products"] = products_df
+    WORKER_DIMS["drivers"] = drivers_df
+    WORKER_DIMS["experiments"] = experiments_df
+
+
+def renumber_ids(df: pd.DataFrame, column: str, prefix: str, current_date: date, counter: int) -> int:
+    """Rewrite worker-local sequence IDs onto the global running counter. Returns the updated counter."""
+    from data_simulation.utils.ids import day_stamp, sequence_ids
+
+    if len(df) == 0:
+        return counter
+    stamp, _, _ = day_stamp(current_date)
+    df[column] = sequence_ids(f"{prefix}-{stamp}-", counter, len(df), 5)
+    return counter + len(df)
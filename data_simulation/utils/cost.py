@@ -4,6 +4,8 @@ Cost calculation utilities.
 Holding cost, delivery cost, shipment cost, fulfillment cost.
 """
 
+import numpy as np
+
 from config.constants import (
     DELIVERY_BASE_COST,
     DELIVERY_COST_PER_KM,
@@ -13,49 +15,50 @@ from config.constants import (
 )
 
 
-def calculate_holding_cost(closing_stock: int, cost_price: float) -> float:
+def calculate_holding_cost(closing_stock, cost_price, warehouse_multiplier=1.0):
     """
-    Daily holding cost for a product at a warehouse.
-    holding_cost = closing_stock * cost_price * daily_rate
+    Daily holding cost for a product at a warehouse (or an array of them).
+    holding_cost = closing_stock * cost_price * daily_rate * warehouse_multiplier
     """
-    return round(closing_stock * cost_price * HOLDING_COST_RATE, 2)
+    return np.round(closing_stock * cost_price * HOLDING_COST_RATE * warehouse_multiplier, 2)
 
 
-def calculate_inventory_value(closing_stock: int, cost_price: float) -> float:
+def calculate_inventory_value(closing_stock, cost_price):
     """
-    Total inventory value at cost.
+    Total inventory value at cost (scalar or array).
     """
-    return round(closing_stock * cost_price, 2)
+    return np.round(closing_stock * cost_price, 2)
 
 
-def calculate_delivery_cost(distance_km: float) -> float:
+def calculate_delivery_cost(distance_km):
     """
-    Cost to deliver an order.
+    Cost to deliver an order (or an array of orders).
     delivery_cost = base_cost + (distance * per_km_rate)
     """
-    return round(DELIVERY_BASE_COST + (distance_km * DELIVERY_COST_PER_KM), 2)
+    return np.round(DELIVERY_BASE_COST + (distance_km * DELIVERY_COST_PER_KM), 2)
 
 
-def calculate_shipment_cost(quantity: int) -> float:
+def calculate_shipment_cost(quantity):
     """
-    Cost for a supplier-to-warehouse shipment.
+    Cost for a supplier-to-warehouse shipment (or an array of shipments).
     shipment_cost = base_cost + (quantity * per_unit_rate)
     """
-    return round(SHIPMENT_BASE_COST + (quantity * SHIPMENT_COST_PER_UNIT), 2)
+    return np.round(SHIPMENT_BASE_COST + (quantity * SHIPMENT_COST_PER_UNIT), 2)
 
 
-def calculate_fulfillment_cost(delivery_cost: float, items_holding_cost: float) -> float:
+def calculate_fulfillment_cost(delivery_cost, items_holding_cost):
     """
-    Total fulfillment cost for an order.
+    Total fulfillment cost for an order (or an array of orders).
     Simplified: delivery + proportion of holding cost.
     """
-    return round(delivery_cost + items_holding_cost * 0.1, 2)
+    return np.round(delivery_cost + items_holding_cost * 0.1, 2)
 
 
-def calculate_days_of_supply(closing_stock: int, avg_daily_demand: float) -> float:
+def calculate_days_of_supply(closing_stock, avg_daily_demand):
     """
-    How many days of inventory remain at current demand rate.
+    How many days of inventory remain at current demand rate (scalar or array).
+    No demand counts as 99.99 days (effectively infinite). Scalar inputs give a
+    scalar back rather than a 0-d array.
     """
-    if avg_daily_demand <= 0:
-        return 99.99  # Effectively infinite
-    return round(closing_stock / avg_daily_demand, 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(avg_daily_demand > 0, np.round(np.divide(closing_stock, avg_daily_demand), 2), 99.99)[()]
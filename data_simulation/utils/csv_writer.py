@@ -0,0 +1,28 @@
+# data_simulation/utils/csv_writer.py
+"""
+CSV serialization through pyarrow's multi-threaded C++ writer.
+Used by the local backfill scripts in place of DataFrame.to_csv.
+"""
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+
+def write_csv(df: pd.DataFrame | pa.Table, sink) -> None:
+    """
+    Write a DataFrame (or an Arrow table) as CSV (header + rows, no index) to a path or file-like sink.
+    Timestamps are cast to second precision so values read "2025-02-02 06:23:00",
+    as pandas writes them, instead of pyarrow's nanosecond text. Tables without
+    timestamps (most dimensions) are written as converted, with no cast pass.
+    """
+    table = df if isinstance(df, pa.Table) else pa.Table.from_pandas(df, preserve_index=False)
+    if any(pa.types.is_timestamp(field.type) for field in table.schema):
+        schema = pa.schema(
+            [
+                field.with_type(pa.timestamp("s")) if pa.types.is_timestamp(field.type) else field
+                for field in table.schema
+            ]
+        )
+        table = table.cast(schema, safe=False)
+    pacsv.write_csv(table, sink)
@@ -0,0 +1,28 @@
+# data_simulation/utils/frame_cache.py
+"""
+Per-run lookup caching for the daily generators.
+"""
+
+from functools import wraps
+
+import pandas as pd
+
+
+def reuse_for_same_frame(builder):
+    """
+    Cache a builder's result for the last DataFrame it was called with.
+    The backfills, the Lambda and the extension pass the same dimension
+    frames every day, so per-run lookups are built once instead of daily.
+    Frames are matched by identity, so a new or replaced frame rebuilds;
+    a frame must not be modified in place once the day loop has started.
+    """
+    last = {}
+
+    @wraps(builder)
+    def wrapper(df: pd.DataFrame):
+        if last.get("frame") is not df:
+            last["result"] = builder(df)
+            last["frame"] = df
+        return last["result"]
+
+    return wrapper
@@ -10,7 +10,15 @@ from typing import Tuple
 
 import numpy as np
 
-from config.warehouse_config import WAREHOUSE_COORDS, WAREHOUSE_IDS
+from config.warehouse_config import (
+    WAREHOUSE_COORDS,
+    WAREHOUSE_COORDS_RAD,
+    WAREHOUSE_ID_ARR,
+    WAREHOUSE_LAT,
+    WAREHOUSE_LON,
+)
+
+EARTH_RADIUS_KM = 6371.0
 
 
 def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -26,25 +34,51 @@ def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
     c = 2 * asin(sqrt(a))
 
-    earth_radius_km = 6371.0
-    return earth_radius_km * c
+    return EARTH_RADIUS_KM * c
 
 
 def find_nearest_warehouse(customer_lat: float, customer_lon: float) -> str:
     """
     Find the nearest warehouse to a customer location.
-    Returns warehouse_id.
+    Returns warehouse_id. A one-point call of find_nearest_warehouses, so all
+    warehouses are compared in one vectorized haversine pass.
+    """
+    return find_nearest_warehouses(np.array([customer_lat]), np.array([customer_lon]))[0]
+
+
+def haversine_all(points_rad: np.ndarray, wh_rad: np.ndarray = WAREHOUSE_COORDS_RAD) -> np.ndarray:
+    """
+    Great-circle distance (km) from every point to every warehouse.
+    Both inputs are (n, 2) [lat, lon] arrays in radians; the (n_points, n_warehouses)
+    result is float32, where NumPy's sin/cos/arcsin loops are SIMD-vectorized.
+    """
+    points_rad = np.asarray(points_rad, dtype=np.float32)
+    wh_rad = np.asarray(wh_rad, dtype=np.float32)
+    lat = points_rad[:, 0:1]
+    lon = points_rad[:, 1:2]
+    wh_lat = wh_rad[:, 0]
+    wh_lon = wh_rad[:, 1]
+    a = np.sin((wh_lat - lat) / 2) ** 2 + np.cos(lat) * np.cos(wh_lat) * np.sin((wh_lon - lon) / 2) ** 2
+    return 2 * np.float32(EARTH_RADIUS_KM) * np.arcsin(np.sqrt(a))
+
+
+def to_radians(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Stack degree lat/lon columns into the (n, 2) float32 radian layout used by haversine_all."""
+    return np.radians(np.column_stack([lat, lon])).astype(np.float32)
+
+
+def nearest_warehouse_codes(customer_lat: np.ndarray, customer_lon: np.ndarray) -> np.ndarray:
+    """
+    Position in WAREHOUSE_IDS of the nearest warehouse for every point.
+    Computes haversine to all 8 warehouses as one (n, 8) array and takes the argmin —
+    with this few warehouses a brute-force pass is cheaper than a tree query.
     """
-    min_dist = float("inf")
-    nearest_wh = WAREHOUSE_IDS[0]
+    return np.argmin(haversine_all(to_radians(customer_lat, customer_lon)), axis=1)
 
-    for wh_id, (wh_lat, wh_lon) in WAREHOUSE_COORDS.items():
-        dist = haversine_km(customer_lat, customer_lon, wh_lat, wh_lon)
-        if dist < min_dist:
-            min_dist = dist
-            nearest_wh = wh_id
 
-    return nearest_wh
+def find_nearest_warehouses(customer_lat: np.ndarray, customer_lon: np.ndarray) -> np.ndarray:
+    """Vectorized find_nearest_warehouse: returns the nearest warehouse_id for every point."""
+    return WAREHOUSE_ID_ARR[nearest_warehouse_codes(customer_lat, customer_lon)]
 
 
 def get_delivery_distance(warehouse_id: str, customer_lat: float, customer_lon: float) -> float:
@@ -60,6 +94,23 @@ def get_delivery_distance(warehouse_id: str, customer_lat: float, customer_lon:
     return round(straight_line * road_factor, 2)
 
 
+def get_delivery_distances(wh_codes: np.ndarray, customer_lat: np.ndarray, customer_lon: np.ndarray) -> np.ndarray:
+    """
+    Vectorized get_delivery_distance for many orders at once.
+    wh_codes are positions in WAREHOUSE_IDS; computed in float64 so values match the scalar version.
+    """
+    lat1 = np.radians(WAREHOUSE_LAT[wh_codes])
+    lon1 = np.radians(WAREHOUSE_LON[wh_codes])
+    lat2 = np.radians(np.asarray(customer_lat, dtype=np.float64))
+    lon2 = np.radians(np.asarray(customer_lon, dtype=np.float64))
+
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    straight_line = EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(a))
+
+    road_factor = 1.3
+    return np.round(straight_line * road_factor, 2)
+
+
 def generate_customer_location(warehouse_id: str, rng: np.random.Generator) -> Tuple[float, float]:
     """
     Generate a customer location near a specific warehouse.
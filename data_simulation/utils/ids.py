@@ -0,0 +1,44 @@
+# data_simulation/utils/ids.py
+"""
+Sequential ID strings (ORD-20240801-00001, CUST-00042, ...).
+"""
+
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+
+from config.constants import BATCH_ID_PREFIX
+
+# Entry r is f"{r:04d}": the low four digits of every sequence number
+_LOW_DIGITS = np.array([f"{r:04d}" for r in range(10_000)], dtype=object)
+
+
+def sequence_ids(prefix: str, start: int, n: int, width: int) -> np.ndarray:
+    """
+    Return [f"{prefix}{i:0{width}d}" for i in range(start, start + n)] as an object array
+    (width >= 4). Each number is split as i = high * 10000 + low: the low four digits come
+    from a table formatted once per process and only the few distinct high parts of the
+    range are formatted per call, so counters in the millions (the extension backfill
+    continues the historical ones) cost the same as small ones.
+    """
+    high, low = np.divmod(np.arange(start, start + n), 10_000)
+    first_high = start // 10_000
+    high_digits = np.array(
+        [f"{h:0{width - 4}d}" if width > 4 else (str(h) if h else "") for h in range(first_high, high[-1] + 1)]
+        if n
+        else [],
+        dtype=object,
+    )
+    return prefix + high_digits[high - first_high] + _LOW_DIGITS[low]
+
+
+@lru_cache(maxsize=8)
+def day_stamp(current_date: date) -> tuple:
+    """
+    (yyyymmdd, batch_id, day start as datetime64[ns]) for a simulation day.
+    Every daily generator stamps its rows with these, so they are formatted
+    once per day instead of once per generator.
+    """
+    date_str = current_date.strftime("%Y%m%d")
+    return date_str, f"{BATCH_ID_PREFIX}_{date_str}", np.datetime64(current_date, "ns")
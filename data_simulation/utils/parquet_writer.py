@@ -0,0 +1,74 @@
+# data_simulation/utils/parquet_writer.py
+"""
+Parquet serialization for fact tables written by the local backfill scripts.
+Dimensions stay CSV (see csv_writer.py); facts are loaded into Snowflake with
+parquet_format + MATCH_BY_COLUMN_NAME.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config.constants import FACT_SCHEMAS
+
+# Categoricals are always written as dictionary<int32, string> so the index width
+# does not depend on how many labels a given month happens to contain
+_DICTIONARY_TYPE = pa.dictionary(pa.int32(), pa.string())
+
+
+def _arrow_table(df: pd.DataFrame, table_name: str) -> pa.Table:
+    """
+    Convert a fact frame to Arrow with a schema pinned per table, so every month of
+    output agrees. FACT_SCHEMAS columns get their declared types, timestamps are
+    fixed to microseconds, and object columns that are entirely null (e.g.
+    experiment_id in a month without experiments) are typed as string, not null.
+    """
+    declared = {col: dtype for col, dtype in FACT_SCHEMAS.get(table_name, {}).items() if col in df.columns}
+    df = df.astype(declared, copy=False)
+
+    fields = []
+    for field in pa.Schema.from_pandas(df, preserve_index=False):
+        dtype = declared.get(field.name)
+        if dtype == "category":
+            arrow_type = _DICTIONARY_TYPE
+        elif dtype is not None:
+            arrow_type = pa.from_numpy_dtype(np.dtype(dtype))
+        elif pa.types.is_timestamp(field.type):
+            arrow_type = pa.timestamp("us")
+        elif pa.types.is_null(field.type):
+            arrow_type = pa.string()
+        else:
+            arrow_type = field.type
+        fields.append(pa.field(field.name, arrow_type))
+    return pa.Table.from_pandas(df, schema=pa.schema(fields), preserve_index=False)
+
+
+def write_parquet(frames: list, sink, table_name: str) -> int:
+    """
+    Write one or more frames of a fact table as a single ZSTD-compressed Parquet file.
+    The schema is pinned per table (see _arrow_table; categoricals are written
+    dictionary-encoded), and each non-empty frame becomes its own row group.
+    Returns the number of rows written; nothing is written when every frame is empty.
+    """
+    frames = [df for df in frames if len(df) > 0]
+    if not frames:
+        return 0
+
+    # Convert everything at once so every row group shares one schema
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    table = _arrow_table(df, table_name)
+    with pq.ParquetWriter(
+        sink,
+        table.schema,
+        compression="zstd",
+        compression_level=3,
+        use_dictionary=True,
+        coerce_timestamps="us",
+    ) as writer:
+        offset = 0
+        for frame in frames:
+            writer.write_table(table.slice(offset, len(frame)))
+            offset += len(frame)
+    return table.num_rows
+
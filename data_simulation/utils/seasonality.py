@@ -181,6 +181,11 @@ CATEGORY_GROWTH_MODIFIERS = {
 }
 
 HOLIDAY_MULTIPLIER = 1.25
+# (month, day) of each holiday, including the Black Friday weekend
+_HOLIDAYS = frozenset({(1, 1), (7, 4), (12, 25), (11, 24), (11, 25), (11, 26), (11, 27)})
+# The same days as one bitmap per month (index 1-12): bit d is set when day d
+# is a holiday, so a lookup is a shift and a mask instead of hashing a tuple
+_HOLIDAY_BITS = tuple(sum(1 << day for m, day in _HOLIDAYS if m == month) for month in range(13))
 
 # ── Noise Configuration ──
 # Larger noise creates more realistic day-to-day fluctuation
@@ -207,15 +212,7 @@ def get_demand_multiplier(current_date: date, category: str = None, rng: np.rand
     multiplier *= DAY_OF_WEEK_MULTIPLIERS.get(dow, 1.0)
 
     # Holiday effect
-    is_holiday = (month, current_date.day) in {
-        (1, 1),
-        (7, 4),
-        (12, 25),
-        (11, 24),
-        (11, 25),
-        (11, 26),
-        (11, 27),
-    }
+    is_holiday = (_HOLIDAY_BITS[month] >> current_date.day) & 1
     if is_holiday:
         multiplier *= HOLIDAY_MULTIPLIER
 
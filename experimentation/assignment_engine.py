@@ -351,6 +351,7 @@ per-observation noise, which is statistically equivalent for large N
 (Central Limit Theorem) and uses zero memory.
 """
 
+import numpy as np
 import pandas as pd
 
 # ── Treatment Effect Configuration ───────────────────────────
@@ -389,7 +390,7 @@ JOIN_SQL = {
         JOIN RAW.FACT_ORDERS o ON a.order_id = o.order_id
         LEFT JOIN RAW.DIM_CUSTOMER c ON o.customer_id = c.customer_id
         WHERE o.order_status != 'Cancelled'
-          AND a.experiment_id = '{exp_id}'
+          AND a.experiment_id IN ({exp_ids})
     """,
     "warehouse_allocation": """
         SELECT a.experiment_id, a.group_name, o.total_fulfillment_cost AS metric_value,
@@ -398,7 +399,7 @@ JOIN_SQL = {
         JOIN RAW.FACT_ORDERS o ON a.order_id = o.order_id
         LEFT JOIN RAW.DIM_CUSTOMER c ON o.customer_id = c.customer_id
         WHERE o.order_status != 'Cancelled'
-          AND a.experiment_id = '{exp_id}'
+          AND a.experiment_id IN ({exp_ids})
     """,
     "routing_algorithm": """
         SELECT a.experiment_id, a.group_name, d.actual_delivery_minutes AS metric_value,
@@ -410,7 +411,7 @@ JOIN_SQL = {
         WHERE o.order_status != 'Cancelled'
           AND d.delivery_status = 'Delivered'
           AND d.actual_delivery_minutes IS NOT NULL
-          AND a.experiment_id = '{exp_id}'
+          AND a.experiment_id IN ({exp_ids})
     """,
 }
 
@@ -423,6 +424,11 @@ def get_effect_multiplier(experiment_id: str, experiment_type: str, status: str)
     return 1.0 - base  # e.g. 0.88 means 12% reduction
 
 
+def _sql_id_list(ids) -> str:
+    """Quote IDs for a SQL IN (...) list."""
+    return ", ".join(f"'{i}'" for i in ids)
+
+
 def load_experiment_summary_stats(conn, fast_query_fn) -> tuple:
     """
     Load experiment metadata and compute per-experiment, per-group summary
@@ -438,19 +444,20 @@ def load_experiment_summary_stats(conn, fast_query_fn) -> tuple:
 
     all_stats = []
 
-    for _, exp in experiments.iterrows():
-        exp_id = exp["experiment_id"]
-        exp_type = exp["experiment_type"]
-        status = exp["status"]
-        metric = METRIC_MAP.get(exp_type)
-
+    # One grouped query per experiment type covers all of its experiments,
+    # instead of one round trip (and one scan of the join) per experiment
+    for exp_type, type_exps in experiments.groupby("experiment_type", sort=False):
         if exp_type not in JOIN_SQL:
             continue
 
-        print(f"  Aggregating {exp_id} ({exp_type})...")
+        exp_ids = type_exps["experiment_id"].tolist()
+        statuses = dict(zip(exp_ids, type_exps["status"]))
+        metric = METRIC_MAP.get(exp_type)
+
+        print(f"  Aggregating {', '.join(exp_ids)} ({exp_type})...")
 
         # Get summary stats from Snowflake — only returns 2 rows per experiment
-        base_sql = JOIN_SQL[exp_type].format(exp_id=exp_id)
+        base_sql = JOIN_SQL[exp_type].format(exp_ids=_sql_id_list(exp_ids))
         stats_sql = f"""
             SELECT
                 experiment_id,
@@ -467,21 +474,27 @@ def load_experiment_summary_stats(conn, fast_query_fn) -> tuple:
         if len(stats_df) == 0:
             continue
 
-        # Apply treatment effect to Treatment group stats
-        multiplier = get_effect_multiplier(exp_id, exp_type, status)
+        # Apply each experiment's treatment effect to its Treatment group stats
+        multiplier = stats_df["experiment_id"].map(
+            {exp_id: get_effect_multiplier(exp_id, exp_type, status) for exp_id, status in statuses.items()}
+        )
         treat_mask = stats_df["group_name"] == "Treatment"
-        stats_df.loc[treat_mask, "mean_value"] = stats_df.loc[treat_mask, "mean_value"] * multiplier
+        stats_df.loc[treat_mask, "mean_value"] = stats_df.loc[treat_mask, "mean_value"] * multiplier[treat_mask]
         # Variance scales by multiplier^2
-        stats_df.loc[treat_mask, "var_value"] = stats_df.loc[treat_mask, "var_value"] * (multiplier**2)
-        stats_df.loc[treat_mask, "std_value"] = stats_df.loc[treat_mask, "std_value"] * abs(multiplier)
+        stats_df.loc[treat_mask, "var_value"] = stats_df.loc[treat_mask, "var_value"] * (multiplier[treat_mask] ** 2)
+        stats_df.loc[treat_mask, "std_value"] = stats_df.loc[treat_mask, "std_value"] * multiplier[treat_mask].abs()
 
         stats_df["experiment_type"] = exp_type
-        stats_df["status"] = status
+        stats_df["status"] = stats_df["experiment_id"].map(statuses)
         stats_df["metric_name"] = metric
         all_stats.append(stats_df)
 
     if all_stats:
-        combined = pd.concat(all_stats, ignore_index=True)
+        # Experiments in dim_experiments order
+        exp_order = {exp_id: i for i, exp_id in enumerate(experiments["experiment_id"])}
+        combined = pd.concat(all_stats, ignore_index=True).sort_values(
+            "experiment_id", key=lambda ids: ids.map(exp_order), kind="stable", ignore_index=True
+        )
     else:
         combined = pd.DataFrame()
 
@@ -493,74 +506,81 @@ def load_segment_stats(conn, fast_query_fn, experiments: pd.DataFrame) -> pd.Dat
     """
     Load segment-level summary stats for uplift analysis.
     All aggregation done in Snowflake — returns ~100-200 rows total.
+    Each experiment type is one query: its join is written once as a CTE and
+    shared by the customer segment, order priority and region breakdowns of
+    every experiment of that type.
     """
     all_segments = []
 
-    for _, exp in experiments.iterrows():
-        exp_id = exp["experiment_id"]
-        exp_type = exp["experiment_type"]
-        status = exp["status"]
-
+    for exp_type, type_exps in experiments.groupby("experiment_type", sort=False):
         if exp_type not in JOIN_SQL:
             continue
 
-        base_sql = JOIN_SQL[exp_type].format(exp_id=exp_id)
-        multiplier = get_effect_multiplier(exp_id, exp_type, status)
+        exp_ids = type_exps["experiment_id"].tolist()
+        statuses = dict(zip(exp_ids, type_exps["status"]))
+        base_sql = JOIN_SQL[exp_type].format(exp_ids=_sql_id_list(exp_ids))
 
-        # Customer segment breakdown
-        for segment_col, segment_label in [
-            ("customer_segment", "customer_segment"),
-            ("order_priority", "order_priority"),
-        ]:
-            seg_sql = f"""
+        # Customer segment and order priority breakdowns, then warehouse region
+        breakdowns = [
+            f"""
                 SELECT
-                    '{exp_id}' AS experiment_id,
-                    '{segment_label}' AS segment_type,
+                    experiment_id,
+                    '{segment_col}' AS segment_type,
                     {segment_col} AS segment_value,
                     group_name,
                     COUNT(*) AS n,
                     AVG(metric_value) AS mean_value,
                     VARIANCE(metric_value) AS var_value
-                FROM ({base_sql})
+                FROM base
                 WHERE {segment_col} IS NOT NULL
-                GROUP BY {segment_col}, group_name
+                GROUP BY experiment_id, {segment_col}, group_name
                 HAVING COUNT(*) >= 10
             """
-            seg_df = fast_query_fn(conn, seg_sql)
-            if len(seg_df) > 0:
-                seg_df["experiment_type"] = exp_type
-                seg_df["status"] = status
-                # Apply treatment effect
-                treat_mask = seg_df["group_name"] == "Treatment"
-                seg_df.loc[treat_mask, "mean_value"] = seg_df.loc[treat_mask, "mean_value"] * multiplier
-                seg_df.loc[treat_mask, "var_value"] = seg_df.loc[treat_mask, "var_value"] * (multiplier**2)
-                all_segments.append(seg_df)
-
-        # Warehouse region breakdown
-        region_sql = f"""
-            SELECT
-                '{exp_id}' AS experiment_id,
-                'region' AS segment_type,
-                w.region AS segment_value,
-                sub.group_name,
-                COUNT(*) AS n,
-                AVG(sub.metric_value) AS mean_value,
-                VARIANCE(sub.metric_value) AS var_value
-            FROM ({base_sql}) sub
-            JOIN RAW.DIM_WAREHOUSE w ON sub.warehouse_id = w.warehouse_id
-            WHERE w.region IS NOT NULL
-            GROUP BY w.region, sub.group_name
-            HAVING COUNT(*) >= 10
-        """
-        reg_df = fast_query_fn(conn, region_sql)
-        if len(reg_df) > 0:
-            reg_df["experiment_type"] = exp_type
-            reg_df["status"] = status
-            treat_mask = reg_df["group_name"] == "Treatment"
-            reg_df.loc[treat_mask, "mean_value"] = reg_df.loc[treat_mask, "mean_value"] * multiplier
-            reg_df.loc[treat_mask, "var_value"] = reg_df.loc[treat_mask, "var_value"] * (multiplier**2)
-            all_segments.append(reg_df)
+            for segment_col in ("customer_segment", "order_priority")
+        ]
+        breakdowns.append("""
+                SELECT
+                    sub.experiment_id,
+                    'region' AS segment_type,
+                    w.region AS segment_value,
+                    sub.group_name,
+                    COUNT(*) AS n,
+                    AVG(sub.metric_value) AS mean_value,
+                    VARIANCE(sub.metric_value) AS var_value
+                FROM base sub
+                JOIN RAW.DIM_WAREHOUSE w ON sub.warehouse_id = w.warehouse_id
+                WHERE w.region IS NOT NULL
+                GROUP BY sub.experiment_id, w.region, sub.group_name
+                HAVING COUNT(*) >= 10
+            """)
+        seg_sql = f"WITH base AS ({base_sql})" + " UNION ALL ".join(breakdowns)
+        seg_df = fast_query_fn(conn, seg_sql)
+        if len(seg_df) == 0:
+            continue
+
+        seg_df["experiment_type"] = exp_type
+        seg_df["status"] = seg_df["experiment_id"].map(statuses)
+        # Apply each experiment's treatment effect
+        multiplier = seg_df["experiment_id"].map(
+            {exp_id: get_effect_multiplier(exp_id, exp_type, status) for exp_id, status in statuses.items()}
+        )
+        treat_mask = seg_df["group_name"] == "Treatment"
+        seg_df.loc[treat_mask, "mean_value"] = seg_df.loc[treat_mask, "mean_value"] * multiplier[treat_mask]
+        seg_df.loc[treat_mask, "var_value"] = seg_df.loc[treat_mask, "var_value"] * (multiplier[treat_mask] ** 2)
+        all_segments.append(seg_df)
 
     if all_segments:
-        return pd.concat(all_segments, ignore_index=True)
+        # Experiments in dim_experiments order, each with its customer segment,
+        # order priority and region rows in that order
+        exp_order = {exp_id: i for i, exp_id in enumerate(experiments["experiment_id"])}
+        segment_order = {"customer_segment": 0, "order_priority": 1, "region": 2}
+        combined = pd.concat(all_segments, ignore_index=True)
+        return combined.iloc[
+            np.lexsort(
+                (
+                    combined["segment_type"].map(segment_order).to_numpy(),
+                    combined["experiment_id"].map(exp_order).to_numpy(),
+                )
+            )
+        ].reset_index(drop=True)
     return pd.DataFrame()
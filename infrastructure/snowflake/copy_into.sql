@@ -42,50 +42,57 @@ FILE_FORMAT = csv_format
 ON_ERROR = 'CONTINUE';
 
 -- ============================================================
--- FACT TABLES (date-partitioned in S3)
+-- FACT TABLES (date-partitioned Parquet in S3)
 -- ============================================================
 
 COPY INTO fact_orders
 FROM @s3_fulfillment_stage/fact_orders/
-FILE_FORMAT = csv_format
+FILE_FORMAT = parquet_format
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
 ON_ERROR = 'CONTINUE'
-PATTERN = '.*data\.csv';
+PATTERN = '.*data\.parquet';
 
 COPY INTO fact_order_items
 FROM @s3_fulfillment_stage/fact_order_items/
-FILE_FORMAT = csv_format
+FILE_FORMAT = parquet_format
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
 ON_ERROR = 'CONTINUE'
-PATTERN = '.*data\.csv';
+PATTERN = '.*data\.parquet';
 
 COPY INTO fact_inventory_snapshot
 FROM @s3_fulfillment_stage/fact_inventory_snapshot/
-FILE_FORMAT = csv_format
+FILE_FORMAT = parquet_format
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
 ON_ERROR = 'CONTINUE'
-PATTERN = '.*data\.csv';
+PATTERN = '.*data\.parquet';
 
 COPY INTO fact_shipments
 FROM @s3_fulfillment_stage/fact_shipments/
-FILE_FORMAT = csv_format
+FILE_FORMAT = parquet_format
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
 ON_ERROR = 'CONTINUE'
-PATTERN = '.*data\.csv';
+PATTERN = '.*data\.parquet';
 
 COPY INTO fact_deliveries
 FROM @s3_fulfillment_stage/fact_deliveries/
-FILE_FORMAT = csv_format
+FILE_FORMAT = parquet_format
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
 ON_ERROR = 'CONTINUE'
-PATTERN = '.*data\.csv';
+PATTERN = '.*data\.parquet';
 
 COPY INTO fact_driver_activity
 FROM @s3_fulfillment_stage/fact_driver_activity/
-FILE_FORMAT = csv_format
+FILE_FORMAT = parquet_format
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
 ON_ERROR = 'CONTINUE'
-PATTERN = '.*data\.csv';
+PATTERN = '.*data\.parquet';
 
 COPY INTO fact_experiment_assignments
 FROM @s3_fulfillment_stage/fact_experiment_assignments/
-FILE_FORMAT = csv_format
+FILE_FORMAT = parquet_format
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
 ON_ERROR = 'CONTINUE'
-PATTERN = '.*data\.csv';
+PATTERN = '.*data\.parquet';
 
 
 
@@ -59,55 +59,64 @@ SELECT 'dim_customer',         COUNT(*)              FROM dim_customer;
 -- Expected: 500, 6, 295, 10000
 
 -- ── Step 3: Load new fact data (2025-2026 only) ───────────────
--- PATTERN matches only date=2025... and date=2026... partitions.
--- Prevents reloading 2022-2024 data. FORCE=TRUE bypasses load history.
+-- Facts are one Parquet file per month (month=YYYY-MM/extension.parquet),
+-- loaded by column name.
+-- PATTERN matches only the extension files, never the original backfill's
+-- month=.../data.parquet (2025-02 holds both). FORCE=TRUE bypasses load history.
 
 COPY INTO fact_orders
 FROM @s3_fulfillment_stage/fact_orders/
-FILE_FORMAT = csv_format
-PATTERN = '.*date=202[5-6].*/data\.csv'
+FILE_FORMAT = parquet_format
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
+PATTERN = '.*month=202[5-6]-[0-9]{2}/extension\.parquet'
 FORCE = TRUE
 ON_ERROR = 'CONTINUE';
 
 COPY INTO fact_order_items
 FROM @s3_fulfillment_stage/fact_order_items/
-FILE_FORMAT = csv_format
-PATTERN = '.*date=202[5-6].*/data\.csv'
+FILE_FORMAT = parquet_format
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
+PATTERN = '.*month=202[5-6]-[0-9]{2}/extension\.parquet'
 FORCE = TRUE
 ON_ERROR = 'CONTINUE';
 
 COPY INTO fact_inventory_snapshot
 FROM @s3_fulfillment_stage/fact_inventory_snapshot/
-FILE_FORMAT = csv_format
-PATTERN = '.*date=202[5-6].*/data\.csv'
+FILE_FORMAT = parquet_format
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
+PATTERN = '.*month=202[5-6]-[0-9]{2}/extension\.parquet'
 FORCE = TRUE
 ON_ERROR = 'CONTINUE';
 
 COPY INTO fact_shipments
 FROM @s3_fulfillment_stage/fact_shipments/
-FILE_FORMAT = csv_format
-PATTERN = '.*date=202[5-6].*/data\.csv'
+FILE_FORMAT = parquet_format
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
+PATTERN = '.*month=202[5-6]-[0-9]{2}/extension\.parquet'
 FORCE = TRUE
 ON_ERROR = 'CONTINUE';
 
 COPY INTO fact_deliveries
 FROM @s3_fulfillment_stage/fact_deliveries/
-FILE_FORMAT = csv_format
-PATTERN = '.*date=202[5-6].*/data\.csv'
+FILE_FORMAT = parquet_format
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
+PATTERN = '.*month=202[5-6]-[0-9]{2}/extension\.parquet'
 FORCE = TRUE
 ON_ERROR = 'CONTINUE';
 
 COPY INTO fact_driver_activity
 FROM @s3_fulfillment_stage/fact_driver_activity/
-FILE_FORMAT = csv_format
-PATTERN = '.*date=202[5-6].*/data\.csv'
+FILE_FORMAT = parquet_format
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
+PATTERN = '.*month=202[5-6]-[0-9]{2}/extension\.parquet'
 FORCE = TRUE
 ON_ERROR = 'CONTINUE';
 
 COPY INTO fact_experiment_assignments
 FROM @s3_fulfillment_stage/fact_experiment_assignments/
-FILE_FORMAT = csv_format
-PATTERN = '.*date=202[5-6].*/data\.csv'
+FILE_FORMAT = parquet_format
+MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
+PATTERN = '.*month=202[5-6]-[0-9]{2}/extension\.parquet'
 FORCE = TRUE
 ON_ERROR = 'CONTINUE';
 
@@ -282,6 +282,11 @@ CREATE FILE FORMAT IF NOT EXISTS csv_format
     EMPTY_FIELD_AS_NULL = TRUE
     COMPRESSION = 'AUTO';
 
+-- Backfill fact partitions are written as ZSTD Parquet (loaded by column name)
+CREATE FILE FORMAT IF NOT EXISTS parquet_format
+    TYPE = 'PARQUET'
+    USE_LOGICAL_TYPE = TRUE;
+
 -- ============================================================
 -- 5. EXTERNAL STAGE (S3)
 -- ============================================================
@@ -11,6 +11,7 @@ Usage:
 import argparse
 import io
 import json
+import os
 import time
 from datetime import datetime
 
@@ -39,6 +40,13 @@ TABLE_KEY_MAP = {
     "fact_inventory_snapshot": lambda row: f"{row['warehouse_id']}-{row['product_id']}",
 }
 
+# Local backfill output is monthly Parquet; rows for a day are picked by this column
+TABLE_DATE_COLUMN_MAP = {
+    "fact_orders": "order_date",
+    "fact_deliveries": "created_at",
+    "fact_inventory_snapshot": "snapshot_date",
+}
+
 TABLE_SCHEMA_MAP = {
     "fact_orders": OrderCreatedEvent,
     "fact_deliveries": DeliveryUpdatedEvent,
@@ -64,11 +72,18 @@ def read_csv_from_s3(table: str, date: str) -> pd.DataFrame:
 
 def read_csv_local(table: str, date: str) -> pd.DataFrame:
     path = f"output/raw/{table}/date={date}/data.csv"
-    try:
+    if os.path.exists(path):
         return pd.read_csv(path)
+
+    # Backfill writes one Parquet file per month (see data_simulation/backfill.py)
+    parquet_path = f"output/raw/{table}/month={date[:7]}/data.parquet"
+    try:
+        df = pd.read_parquet(parquet_path)
     except FileNotFoundError:
-        print(f"  No local file found: {path}")
+        print(f"  No local file found: {path} or {parquet_path}")
         return pd.DataFrame()
+    day = pd.to_datetime(df[TABLE_DATE_COLUMN_MAP[table]]).dt.strftime("%Y-%m-%d")
+    return df[day == date].reset_index(drop=True)
 
 
 def produce_events(date: str, source: str = "s3", delay_ms: float = 5):
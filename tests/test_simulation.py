@@ -1,5 +1,7 @@
 """Basic tests for the fulfillment platform configuration and data simulation."""
 
+import numpy as np
+
 from config.constants import (
     BACKFILL_END_DATE,
     BACKFILL_START_DATE,
@@ -7,7 +9,13 @@ from config.constants import (
     NUM_CUSTOMERS,
     NUM_PRODUCTS,
     NUM_WAREHOUSES,
+    ORDER_PRIORITY_CDF,
+    ORDER_PRIORITY_DISTRIBUTION,
+    ORDER_PRIORITY_KEYS,
     RANDOM_SEED,
+    SLA_MINUTES,
+    SLA_MINUTES_ARR,
+    sample_category,
 )
 
 
@@ -29,3 +37,42 @@ def test_simulation_scale():
 def test_backfill_covers_multiple_years():
     delta = BACKFILL_END_DATE - BACKFILL_START_DATE
     assert delta.days > 365
+
+
+def test_priority_arrays_match_dicts():
+    assert abs(sum(ORDER_PRIORITY_DISTRIBUTION.values()) - 1.0) < 1e-9
+    for code, priority in enumerate(ORDER_PRIORITY_KEYS):
+        assert SLA_MINUTES_ARR[code] == SLA_MINUTES[priority]
+
+
+def test_sample_category_matches_rng_choice():
+    codes = sample_category(np.random.default_rng(RANDOM_SEED), ORDER_PRIORITY_CDF, 1000)
+    probs = list(ORDER_PRIORITY_DISTRIBUTION.values())
+    picks = np.random.default_rng(RANDOM_SEED).choice(ORDER_PRIORITY_KEYS, size=1000, p=probs)
+    assert (ORDER_PRIORITY_KEYS[codes] == picks).all()
+
+
+def test_cached_dimensions_return_independent_copies():
+    from data_simulation.core.dimensions import generate_dim_supplier
+
+    first = generate_dim_supplier()
+    first.loc[0, "reliability_score"] = -1.0
+    assert generate_dim_supplier().loc[0, "reliability_score"] != -1.0
+
+
+def test_seeded_dimensions_are_stable():
+    # The extension backfill and the Lambda regenerate these from RANDOM_SEED and
+    # must reproduce the rows already loaded, so any change to the draws fails here
+    import hashlib
+
+    from data_simulation.core.dimensions import generate_dim_customer, generate_dim_driver, generate_dim_product
+
+    expected = {
+        generate_dim_product: "b207074f71f01a72c49b99a34d8bfe4d5ab75574d79fe2cbb62ef4d2c86f585c",
+        generate_dim_driver: "9bfad307d8069059031a58a98b7dde1ea80491b65939697d27e3c18461272702",
+        generate_dim_customer: "b178cc0b20cae45af7ac1571fbbccda17229b6622b34e43019b7acac259e9fb4",
+    }
+    rng = np.random.default_rng(RANDOM_SEED)
+    for generate, digest in expected.items():
+        csv = generate(rng).to_csv(index=False)
+        assert hashlib.sha256(csv.encode()).hexdigest() == digest, generate.__name__